@@ -0,0 +1,365 @@
+"""Browser-free comparison, list export and history helpers.
+
+Everything here works on plain username lists and files, so offline analysis
+(--load-files, --history) runs without Selenium or Chrome.
+"""
+import json
+import gzip
+import os
+import re
+import sqlite3
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+NON_ALPHANUMERIC = re.compile(r'[^a-zA-Z0-9]')
+
+
+def normalize_username(username):
+    """Normalize username for better comparison"""
+    if not username:
+        return ""
+    # Convert to lowercase and remove non-alphanumeric characters
+    return NON_ALPHANUMERIC.sub('', username.lower().strip())
+
+
+def username_from_href(href):
+    """Extract the username from an Instagram profile URL, or "" for non-profile links"""
+    if not href:
+        return ""
+
+    # Clean and parse URL
+    try:
+        # Remove trailing slash and query parameters
+        href = href.split('?')[0].rstrip('/')
+
+        # Extract username part - avoid common non-username paths
+        invalid_paths = ['/p/', '/explore/', '/reels/', '/stories/', '/direct/', '/tags/']
+
+        # Skip processing if the URL contains invalid paths
+        if any(invalid_path in href for invalid_path in invalid_paths):
+            return ""
+
+        # Extract the username (should be the last part of the URL for profile pages)
+        parts = href.split('/')
+        # Get the last non-empty part
+        username_parts = [part for part in parts if part]
+        if username_parts:
+            return username_parts[-1]
+    except Exception as e:
+        print(f"Error extracting username from URL {href}: {e}")
+
+    return ""
+
+
+def is_valid_username(username):
+    """Check that a string looks like an Instagram username rather than a site path"""
+    if not username:
+        return False
+
+    # Invalid usernames to filter out
+    invalid_keywords = ['explore', 'p', 'reels', 'stories', 'direct', 'tags',
+                        'about', 'accounts', 'legal', 'directory', 'hashtag',
+                        'login', 'signup', 'download', 'help', 'privacy', 'terms',
+                        'api', 'press', 'jobs', 'locations']
+
+    # Check if username looks valid
+    return (
+            username and
+            username.strip() != "" and
+            username.lower() not in invalid_keywords and
+            not username.startswith('p/') and
+            not username.startswith('@') and
+            '?' not in username and
+            '#' not in username and
+            '/' not in username and
+            ' ' not in username and
+            len(username) > 1 and  # Usernames are at least 2 characters
+            len(username) <= 30  # Instagram username length limit
+    )
+
+
+def usernames_from_hrefs(hrefs):
+    """Turn a batch of profile hrefs into valid, de-duplicated usernames, keeping their order"""
+    usernames = []
+    seen = set()
+    for href in hrefs or []:
+        username = username_from_href(href)
+        if is_valid_username(username):
+            username = username.strip()
+            if username not in seen:
+                seen.add(username)
+                usernames.append(username)
+    return usernames
+
+
+def count_from_text(text):
+    """Extract numeric count from text like '123 followers', '1,234 following' or '1.2K'"""
+    if not text:
+        return 0
+
+    # Remove commas and extract digits
+    count_match = re.search(r'([\d,.]+)', text)
+    if count_match:
+        count_text = count_match.group(1).replace(',', '')
+        try:
+            # Handle 'K' (thousands)
+            if 'K' in text or 'k' in text:
+                return int(float(count_text) * 1000)
+            # Handle 'M' (millions)
+            elif 'M' in text or 'm' in text:
+                return int(float(count_text) * 1000000)
+            else:
+                return int(float(count_text))
+        except ValueError:
+            return 0
+    return 0
+
+
+def count_precision(text):
+    """How far the true count can be from count_from_text(text) when it is shown rounded.
+
+    '12.3K' means somewhere around 12,300, give or take 100; exact counts like
+    '1,234' have a precision of 0.
+    """
+    count_match = re.search(r'([\d,.]+)', text or "")
+    if not count_match:
+        return 0
+    if 'K' in text or 'k' in text:
+        multiplier = 1000
+    elif 'M' in text or 'm' in text:
+        multiplier = 1000000
+    else:
+        return 0
+    digits = count_match.group(1).replace(',', '').rstrip('.')
+    decimals = len(digits.split('.')[1]) if '.' in digits else 0
+    return multiplier // (10 ** decimals)
+
+
+def compute_non_followers(following, followers, use_normalized_comparison=True):
+    """Return the accounts in following that are missing from followers, in following order.
+
+    Followers are indexed once in a hash set, so the comparison is linear in
+    the combined size of both lists. With normalized comparison, accounts whose
+    usernames differ only in case or punctuation count as the same account.
+    """
+    key = normalize_username if use_normalized_comparison else (lambda user: user)
+    follower_keys = {key(user) for user in followers if user}
+
+    non_followers = []
+    seen = set()
+    for user in following:
+        if not user or user in seen:
+            continue
+        seen.add(user)
+
+        user_key = key(user)
+        if user_key and user_key not in follower_keys:
+            non_followers.append(user)
+
+    return non_followers
+
+
+OUTPUT_FORMATS = ("json", "ndjson", "ndjson.gz", "ndjson.zst")
+
+
+def open_list_file(path, mode="r"):
+    """Open a list export as text, decompressing .gz and .zst files on the fly"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("Reading or writing .zst files requires the zstandard package")
+        return zstandard.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def iter_usernames(path):
+    """Yield the usernames in a list export one at a time.
+
+    NDJSON files (optionally .gz/.zst compressed) are read line by line, so
+    memory use does not grow with the file. Each line is either a JSON string
+    or an object with a "username" key. Plain .json arrays are still supported,
+    but are loaded whole.
+    """
+    if path.endswith(".json"):
+        with open(path, 'r') as f:
+            yield from json.load(f)
+        return
+
+    with open_list_file(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            username = record.get("username") if isinstance(record, dict) else record
+            if username:
+                yield username
+
+
+def latest_list_file(directory, account, list_type):
+    """Path of the newest export of an account's list in directory, or None.
+
+    Exports are named ACCOUNT_LISTTYPE_YYYYMMDD_HHMMSS.FORMAT, so the newest
+    one sorts last.
+    """
+    pattern = re.compile(rf"^{re.escape(account)}_{re.escape(list_type)}_\d{{8}}_\d{{6}}\.(?:"
+                         + "|".join(re.escape(fmt) for fmt in OUTPUT_FORMATS) + ")$")
+    try:
+        names = sorted(name for name in os.listdir(directory) if pattern.match(name))
+    except OSError:
+        return None
+    return os.path.join(directory, names[-1]) if names else None
+
+
+class ListWriter:
+    """Appends usernames to an NDJSON export as they are harvested"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open_list_file(path, "w")
+        self.written = set()
+
+    def write(self, usernames):
+        """Write the usernames not written yet and flush them to disk"""
+        lines = []
+        for user in usernames:
+            if user and user not in self.written:
+                self.written.add(user)
+                lines.append(json.dumps(user) + "\n")
+        if lines:
+            self.file.writelines(lines)
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class SnapshotStore:
+    """Append-only history of list snapshots, stored as per-run deltas in SQLite.
+
+    Each run only records the usernames that were added or removed since the
+    previous run of the same list, so "what changed" queries read just the
+    changes instead of re-diffing every historical export.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        account TEXT NOT NULL,
+        list_type TEXT NOT NULL,
+        taken_at TEXT NOT NULL,
+        size INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS runs_by_account ON runs (account, list_type, id);
+
+    CREATE TABLE IF NOT EXISTS changes (
+        run_id INTEGER NOT NULL REFERENCES runs (id),
+        username TEXT NOT NULL,
+        change TEXT NOT NULL CHECK (change IN ('added', 'removed'))
+    );
+    CREATE INDEX IF NOT EXISTS changes_by_run ON changes (run_id, change);
+    CREATE INDEX IF NOT EXISTS changes_by_username ON changes (username);
+
+    CREATE TABLE IF NOT EXISTS members (
+        account TEXT NOT NULL,
+        list_type TEXT NOT NULL,
+        username TEXT NOT NULL,
+        PRIMARY KEY (account, list_type, username)
+    ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with self.connect() as conn:
+            conn.executescript(self.SCHEMA)
+
+    def connect(self):
+        """Open a connection (one per operation, so the store can be used from worker threads)"""
+        return sqlite3.connect(self.path, timeout=30)
+
+    def record_snapshot(self, account, list_type, usernames, taken_at=None):
+        """Store a new snapshot as the delta against the previous one. Returns (added, removed)
+
+        The first snapshot of a list is a baseline: its members are stored, but
+        not as changes, so they don't all show up as new.
+        """
+        taken_at = taken_at or datetime.now().isoformat(timespec="seconds")
+        snapshot = set(usernames)
+
+        with self.connect() as conn:
+            baseline = conn.execute("SELECT 1 FROM runs WHERE account = ? AND list_type = ? LIMIT 1",
+                                    (account, list_type)).fetchone() is None
+            previous = {row[0] for row in conn.execute(
+                "SELECT username FROM members WHERE account = ? AND list_type = ?", (account, list_type))}
+            added = sorted(snapshot - previous)
+            removed = sorted(previous - snapshot)
+
+            run_id = conn.execute(
+                "INSERT INTO runs (account, list_type, taken_at, size) VALUES (?, ?, ?, ?)",
+                (account, list_type, taken_at, len(snapshot))).lastrowid
+            if not baseline:
+                conn.executemany("INSERT INTO changes (run_id, username, change) VALUES (?, ?, ?)",
+                                 [(run_id, user, "added") for user in added] +
+                                 [(run_id, user, "removed") for user in removed])
+            conn.executemany("INSERT INTO members (account, list_type, username) VALUES (?, ?, ?)",
+                             [(account, list_type, user) for user in added])
+            conn.executemany("DELETE FROM members WHERE account = ? AND list_type = ? AND username = ?",
+                             [(account, list_type, user) for user in removed])
+
+        return added, removed
+
+    def latest_run(self, account, list_type):
+        """Return (run_id, taken_at, size) of the most recent snapshot, or None"""
+        with self.connect() as conn:
+            return conn.execute(
+                "SELECT id, taken_at, size FROM runs WHERE account = ? AND list_type = ? ORDER BY id DESC LIMIT 1",
+                (account, list_type)).fetchone()
+
+    def run_count(self, account, list_type):
+        """Number of snapshots recorded for a list"""
+        with self.connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM runs WHERE account = ? AND list_type = ?",
+                                (account, list_type)).fetchone()[0]
+
+    def changes_in_latest_run(self, account, list_type, change):
+        """Usernames added or removed by the most recent snapshot of a list"""
+        run = self.latest_run(account, list_type)
+        if not run:
+            return []
+        with self.connect() as conn:
+            return [row[0] for row in conn.execute(
+                "SELECT username FROM changes WHERE run_id = ? AND change = ? ORDER BY username", (run[0], change))]
+
+    def new_followers(self, account):
+        """Accounts that started following since the previous followers snapshot"""
+        return self.changes_in_latest_run(account, "followers", "added")
+
+    def lost_followers(self, account):
+        """Accounts that stopped following since the previous followers snapshot"""
+        return self.changes_in_latest_run(account, "followers", "removed")
+
+    def new_unfollowers(self, account):
+        """Accounts that newly appear among the non-followers since the previous scan"""
+        return self.changes_in_latest_run(account, "non_followers", "added")
+
+
+def print_history_report(store, account):
+    """Print what changed in the latest snapshots of an account"""
+    print(f"\n===== CHANGES SINCE LAST RUN ({account}) =====")
+    for title, list_type, users in (("New followers", "followers", store.new_followers),
+                                    ("Lost followers", "followers", store.lost_followers),
+                                    ("New unfollowers", "non_followers", store.new_unfollowers)):
+        runs = store.run_count(account, list_type)
+        if runs < 2:
+            print(f"{title}: {'first snapshot' if runs else 'no snapshots'}, nothing to compare yet")
+            continue
+        users = users(account)
+        print(f"{title}: {len(users)}")
+        for user in users:
+            print(f"  - {user}")
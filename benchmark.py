@@ -0,0 +1,331 @@
+"""Performance benchmarks for the tracker.
+
+Usage:
+    python benchmark.py compare --sizes 1000 10000 100000 1000000
+    python benchmark.py scrape --sizes 100 1000 10000 50000 --harvest-mode js
+    python benchmark.py replay --fixtures-dir captures/
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import string
+import tempfile
+import time
+import urllib.request
+
+from analysis import compute_non_followers
+from main import UnfollowTracker, parse_user_records
+from mock_instagram import OWNER_ID, MockInstagram
+
+
+def synthetic_usernames(count, seed=0):
+    """Generate count distinct, realistic-looking usernames"""
+    rng = random.Random(seed)
+    alphabet = string.ascii_lowercase + string.digits + "._"
+    usernames = set()
+    while len(usernames) < count:
+        length = rng.randint(4, 20)
+        usernames.add(rng.choice(string.ascii_lowercase) + "".join(rng.choice(alphabet) for _ in range(length)))
+    return list(usernames)
+
+
+def bench_compare(sizes, overlap=0.8, repeats=3, seed=0):
+    """Time compute_non_followers on synthetic lists and check that it scales linearly"""
+    print(f"{'size':>10} {'normalized (s)':>15} {'direct (s)':>12} {'ns/user':>10} {'non-followers':>14}")
+
+    per_user = []
+    for size in sizes:
+        following = synthetic_usernames(size, seed)
+        # Most followed accounts follow back, plus some followers we don't follow
+        rng = random.Random(seed + 1)
+        followers = rng.sample(following, int(size * overlap)) + synthetic_usernames(size // 10, seed + 2)
+        rng.shuffle(followers)
+
+        timings = {}
+        for normalized in (True, False):
+            best = None
+            for _ in range(repeats):
+                started = time.perf_counter()
+                result = compute_non_followers(following, followers, normalized)
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            timings[normalized] = (best, result)
+
+        normalized_time, result = timings[True]
+        ns_per_user = normalized_time / (len(following) + len(followers)) * 1e9
+        per_user.append(ns_per_user)
+        print(f"{size:>10} {normalized_time:>15.4f} {timings[False][0]:>12.4f} {ns_per_user:>10.0f} {len(result):>14}")
+
+    # Linear scaling means the cost per username stays roughly flat as lists grow
+    growth = max(per_user) / min(per_user)
+    print(f"\nPer-username cost varies by {growth:.2f}x across sizes "
+          f"({'linear' if growth < 3 else 'NOT linear'} scaling)")
+    return growth
+
+
+def make_tracker(mock, args, pacing="fixed", browsing="lean"):
+    """Create a tracker pointed at the mock server with benchmark settings"""
+    bot = UnfollowTracker(mock.owner, "benchmark", headless=not args.show_browser,
+                          capture_network=args.harvest_mode == "network", lean=browsing == "lean")
+    bot.URL = mock.base_url
+    bot.api_base_url = mock.base_url
+    bot.debug = False
+    bot.interactive = False
+    bot.use_session_cache = False
+    bot.record_history = False
+    bot.harvest_mode = args.harvest_mode
+    bot.scroll_delay = args.scroll_delay
+    bot.stable_threshold = args.stable_threshold
+    bot.scroll_timeout = args.scroll_timeout
+    bot.adaptive_pacing = pacing == "adaptive"
+    bot.min_scroll_delay = args.min_scroll_delay
+    bot.max_scroll_delay = args.max_scroll_delay
+    bot.prune_rows = args.prune_rows
+    return bot
+
+
+def measure(label, size, truth, func, instrumentation):
+    """Run one extraction phase and score it against the ground truth"""
+    calls_before = instrumentation.webdriver_calls
+    started = time.perf_counter()
+    result = func() or []
+    elapsed = time.perf_counter() - started
+    calls = instrumentation.webdriver_calls - calls_before
+
+    found = set(result) & set(truth)
+    row = {
+        "phase": label,
+        "size": size,
+        "collected": len(set(result)),
+        "seconds": round(elapsed, 3),
+        "usernames_per_second": round(len(found) / elapsed, 2) if elapsed else 0,
+        "webdriver_calls": calls,
+        "calls_per_username": round(calls / len(found), 2) if found else None,
+        "completeness": round(len(found) / len(truth), 4) if truth else 1.0,
+    }
+    print(f"{label:>12} {size:>7} {row['collected']:>9} {row['seconds']:>9.1f} {row['usernames_per_second']:>9.1f} "
+          f"{calls:>9} {row['calls_per_username'] or 0:>10.2f} {row['completeness'] * 100:>8.1f}%")
+    return row
+
+
+def bench_scrape(args):
+    """Scrape mock accounts of increasing size and report speed, WebDriver cost and completeness"""
+    print(f"{'phase':>12} {'size':>7} {'collected':>9} {'seconds':>9} {'users/s':>9} "
+          f"{'wd calls':>9} {'calls/user':>10} {'complete':>9}")
+
+    results = []
+    original_dir = os.getcwd()
+    runs = [(pacing, browsing) for pacing in args.pacing for browsing in args.browsing]
+    for size in args.sizes:
+        for pacing, browsing in runs:
+            mock = MockInstagram(following_count=size, followers_count=int(size * args.followers_ratio),
+                                 page_size=args.page_size, page_latency=args.page_latency,
+                                 avatar_latency=args.avatar_latency, variant=args.variant,
+                                 virtualize=args.virtualize, failure_rate=args.failure_rate, seed=size)
+            with mock, tempfile.TemporaryDirectory() as work_dir:
+                # Keep the tracker's output files out of the real instagram_data/
+                os.chdir(work_dir)
+                bot = make_tracker(mock, args, pacing, browsing)
+                try:
+                    instrumentation = bot.enable_instrumentation()
+                    bot.login()
+
+                    label = "/".join(["dialog"] + ([pacing] if len(args.pacing) > 1 else [])
+                                     + ([browsing] if len(args.browsing) > 1 else []))
+                    row = measure(label, size, mock.following, bot.get_following, instrumentation)
+                    # Browser memory left behind by the dialog (Chrome only)
+                    heap = bot.driver.execute_script(
+                        "return window.performance.memory ? performance.memory.usedJSHeapSize : null")
+                    if heap:
+                        row["js_heap_mb"] = round(heap / 1024 ** 2, 1)
+                    # Background traffic the browser generated while scrolling
+                    row["media_requests"] = mock.stats.get("media", 0)
+                    row["logging_requests"] = mock.stats.get("beacons", 0)
+                    if bot.row_latency is not None:
+                        row["row_latency"] = round(bot.row_latency, 3)
+                        print(f"{'':>12} scroll-to-rows latency {bot.row_latency:.3f}s, "
+                              f"{row['media_requests']} media / {row['logging_requests']} logging requests")
+                    else:
+                        print(f"{'':>12} {row['media_requests']} media / {row['logging_requests']} logging requests")
+                    results.append(row)
+
+                    if args.alternative:
+                        results.append(measure("alternative", size, mock.following,
+                                               bot.get_following_alternative, instrumentation))
+
+                    if args.verify_count:
+                        sample = mock.following[:args.verify_count]
+                        expected = {user: not mock.follows_owner(user) for user in sample}
+                        verdicts = {}
+
+                        def verify_sample():
+                            for user in sample:
+                                verdicts[user] = bot.manually_verify_non_follower(user)
+                            return [user for user in sample if verdicts[user] == expected[user]]
+
+                        row = measure("verify", len(sample), sample, verify_sample, instrumentation)
+                        row["seconds_per_account"] = round(row["seconds"] / len(sample), 2)
+                        results.append(row)
+
+                    # Where the time went: sleeping, WebDriver round trips or Python
+                    results.append({"phase": "breakdown", "size": size, "pacing": pacing, "browsing": browsing,
+                                    "report": instrumentation.report()})
+                finally:
+                    bot.close()
+                    os.chdir(original_dir)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"settings": vars(args), "results": results}, f, indent=2)
+        print(f"Results saved to {args.output}")
+    return results
+
+
+def write_fixtures(fixtures_dir, lists, page_size=12):
+    """Record lists the way --capture-dir does, alternating REST and GraphQL pages"""
+    edge_keys = {"following": "edge_follow", "followers": "edge_followed_by"}
+    for kind, usernames in lists.items():
+        for number, start in enumerate(range(0, len(usernames), page_size), 1):
+            users = [{"pk": str(1000 + start + i), "username": user}
+                     for i, user in enumerate(usernames[start:start + page_size])]
+            if number % 2:
+                url = f"https://www.instagram.com/api/v1/friendships/{OWNER_ID}/{kind}/"
+                body = {"users": users, "next_max_id": str(start + page_size), "status": "ok"}
+            else:
+                # Suggested accounts share the response and must not end up in the list
+                url = "https://www.instagram.com/graphql/query"
+                edges = [{"node": {"id": user["pk"], "username": user["username"]}} for user in users]
+                body = {"data": {"user": {edge_keys[kind]: {"edges": edges},
+                                          "edge_chaining": {"edges": [{"node": {"username": "suggested.user"}}]}}}}
+            with open(os.path.join(fixtures_dir, f"{kind}_{number:04d}.json"), 'w') as f:
+                json.dump({"url": url, "body": json.dumps(body)}, f)
+
+
+def replay_list(mock, kind, page_size):
+    """Page through a list on the mock's friendships API and parse it like the tracker does"""
+    usernames = []
+    max_id = None
+    while True:
+        url = f"{mock.base_url}api/v1/friendships/{OWNER_ID}/{kind}/?count={page_size}"
+        if max_id:
+            url += f"&max_id={max_id}"
+        request = urllib.request.Request(url, headers={"Cookie": "sessionid=replay"})
+        with urllib.request.urlopen(request, timeout=10) as response:
+            payload = json.load(response)
+        if not isinstance(payload.get("users"), list):
+            raise ValueError(f"{kind} page {max_id or 0} is not in the REST shape the dialog reads")
+        usernames.extend(username for username, _ in parse_user_records(payload, kind))
+        max_id = payload.get("next_max_id")
+        if not max_id:
+            return usernames
+
+
+def check_replay(args):
+    """Replay recorded list responses through the mock and check nothing is lost or added"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        fixtures_dir = args.fixtures_dir
+        if not fixtures_dir:
+            fixtures_dir = work_dir
+            rng = random.Random(0)
+            write_fixtures(fixtures_dir, {"following": synthetic_usernames(args.size, 1),
+                                          "followers": rng.sample(synthetic_usernames(args.size, 1), args.size // 2)},
+                           args.page_size)
+
+        mock = MockInstagram(fixtures_dir=fixtures_dir, page_size=args.page_size, page_latency=0)
+        passed = True
+        with mock:
+            for kind in ("following", "followers"):
+                recorded = []
+                for path in sorted(glob.glob(os.path.join(fixtures_dir, f"{kind}_*.json"))):
+                    with open(path, 'r') as f:
+                        body = json.loads(json.load(f)["body"])
+                    recorded.extend(username for username, _ in parse_user_records(body, kind))
+                recorded = list(dict.fromkeys(recorded))
+                try:
+                    replayed = replay_list(mock, kind, args.page_size)
+                except Exception as e:
+                    print(f"{kind:>10}: FAILED ({e})")
+                    passed = False
+                    continue
+                ok = bool(recorded) and replayed == recorded
+                passed = passed and ok
+                print(f"{kind:>10}: {len(replayed)} of {len(recorded)} recorded usernames replayed "
+                      f"{'in order' if ok else '- MISMATCH'}")
+    print("Replay check passed." if passed else "Replay check FAILED.")
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Instagram Unfollow Tracker benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compare_parser = subparsers.add_parser("compare", help="Benchmark the follower comparison engine")
+    compare_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000],
+                                help="List sizes to benchmark (default: 1k to 1M)")
+    compare_parser.add_argument("--overlap", type=float, default=0.8,
+                                help="Share of followed accounts that follow back (default: 0.8)")
+    compare_parser.add_argument("--repeats", type=int, default=3, help="Runs per size, best is kept (default: 3)")
+
+    scrape_parser = subparsers.add_parser("scrape", help="Benchmark scraping against a local mock Instagram")
+    scrape_parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                               help="Following list sizes to benchmark (default: 100 1000 10000)")
+    scrape_parser.add_argument("--followers-ratio", type=float, default=0.9,
+                               help="Followers list size relative to following (default: 0.9)")
+    scrape_parser.add_argument("--harvest-mode", choices=["js", "observer", "network", "webdriver"], default="js",
+                               help="Tracker harvest mode to benchmark (default: js)")
+    scrape_parser.add_argument("--scroll-delay", type=float, default=0.5,
+                               help="Tracker delay between scrolls in seconds (default: 0.5)")
+    scrape_parser.add_argument("--stable-threshold", type=int, default=10,
+                               help="Tracker stable scrolls before stopping (default: 10)")
+    scrape_parser.add_argument("--scroll-timeout", type=int, default=10000,
+                               help="Tracker maximum number of scrolls (default: 10000)")
+    scrape_parser.add_argument("--pacing", nargs="+", choices=["fixed", "adaptive"], default=["fixed"],
+                               help="Scroll pacing to benchmark; give both to compare them (default: fixed)")
+    scrape_parser.add_argument("--browsing", nargs="+", choices=["lean", "full"], default=["lean"],
+                               help="Lean blocks images, video and analytics; give both to compare them "
+                                    "(default: lean)")
+    scrape_parser.add_argument("--min-scroll-delay", type=float, default=0.2,
+                               help="Adaptive pacing lower bound in seconds (default: 0.2)")
+    scrape_parser.add_argument("--max-scroll-delay", type=float, default=8.0,
+                               help="Adaptive pacing upper bound in seconds (default: 8.0)")
+    scrape_parser.add_argument("--prune-rows", action="store_true",
+                               help="Remove harvested rows from the dialog while scrolling")
+    scrape_parser.add_argument("--page-size", type=int, default=12, help="Mock users per page (default: 12)")
+    scrape_parser.add_argument("--page-latency", type=float, default=0.2,
+                               help="Mock seconds per list page (default: 0.2)")
+    scrape_parser.add_argument("--avatar-latency", type=float, default=0.05,
+                               help="Mock seconds per avatar image (default: 0.05)")
+    scrape_parser.add_argument("--variant", choices=["div", "list"], default="div",
+                               help="Mock dialog row markup (default: div)")
+    scrape_parser.add_argument("--virtualize", type=int, default=0,
+                               help="Mock keeps only this many rows in the DOM (default: 0, keep all)")
+    scrape_parser.add_argument("--failure-rate", type=float, default=0.0,
+                               help="Share of mock list pages that fail (default: 0)")
+    scrape_parser.add_argument("--alternative", action="store_true",
+                               help="Also benchmark get_following_alternative")
+    scrape_parser.add_argument("--verify-count", type=int, default=0,
+                               help="Also benchmark manually_verify_non_follower on this many accounts")
+    scrape_parser.add_argument("--show-browser", action="store_true", help="Run Chrome with a visible window")
+    scrape_parser.add_argument("--output", help="Write results as JSON to this file")
+
+    replay_parser = subparsers.add_parser("replay",
+                                          help="Check that --capture-dir fixtures replay through the mock")
+    replay_parser.add_argument("--fixtures-dir",
+                               help="Recorded responses to replay (default: generated REST and GraphQL pages)")
+    replay_parser.add_argument("--size", type=int, default=100, help="Generated list size (default: 100)")
+    replay_parser.add_argument("--page-size", type=int, default=12, help="Users per page (default: 12)")
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        bench_compare(args.sizes, args.overlap, args.repeats)
+    elif args.command == "scrape":
+        bench_scrape(args)
+    elif args.command == "replay" and not check_replay(args):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
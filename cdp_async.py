@@ -0,0 +1,707 @@
+"""Asyncio backend that drives Chrome over the DevTools protocol.
+
+Unlike UnfollowTracker, which blocks on one Selenium command at a time, this
+engine talks to Chrome over a single websocket and multiplexes every tab on
+it, so many tabs and accounts can be driven from one event loop:
+
+    async with Browser(headless=True) as browser:
+        tracker = AsyncTracker("me", "secret", browser)
+        await tracker.login()
+        following, followers = await asyncio.gather(tracker.get_following(), tracker.get_followers())
+
+The page scripts and username helpers are shared with main.py and analysis.py.
+
+Usage:
+    python cdp_async.py --username USER --password PASS --verify-count 10 --concurrency 4
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+import websockets
+
+from analysis import compute_non_followers, count_from_text, usernames_from_hrefs
+from main import (HARVEST_LINKS_JS, LEAN_BLOCKED_URLS, PAGE_CONTAINS_TEXT_JS, PROFILE_COUNT_TEXTS_JS,
+                  ROW_SIGNATURE_JS, WAIT_FOR_ROWS_JS)
+
+CHROME_CANDIDATES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome",
+                     "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome")
+
+SCROLL_BOX_XPATHS = [
+    '//div[@role="dialog"]//div[contains(@style, "overflow")]',
+    '//div[@role="dialog"]//div[contains(@style, "height") and contains(@style, "scroll")]',
+    '//div[@role="dialog"]//ul',
+    '//div[@role="dialog"]//div[@tabindex="0"]',
+    '//div[@role="dialog"]'
+]
+
+# Returns the first visible element taller than 100px matching one of the XPaths in arguments[0]
+FIND_SCROLL_BOX_JS = """
+var xpaths = arguments[0];
+for (var i = 0; i < xpaths.length; i++) {
+    var result = document.evaluate(xpaths[i], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (var j = 0; j < result.snapshotLength; j++) {
+        var el = result.snapshotItem(j);
+        if (el.getBoundingClientRect().height > 100) return el;
+    }
+}
+return null;
+"""
+
+FIND_XPATH_JS = """
+return document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+"""
+
+# Scrolls arguments[0] into view and returns the viewport coordinates of its center
+ELEMENT_CENTER_JS = """
+var el = arguments[0];
+el.scrollIntoView({block: 'center'});
+var rect = el.getBoundingClientRect();
+return [rect.left + rect.width / 2, rect.top + rect.height / 2];
+"""
+
+LOCAL_STORAGE_JS = """
+var items = {};
+for (var i = 0; i < localStorage.length; i++) { var key = localStorage.key(i); items[key] = localStorage.getItem(key); }
+return items;
+"""
+
+
+class CDPError(Exception):
+    """A DevTools command failed or Chrome could not be reached"""
+
+
+class ElementHandle:
+    """Reference to a DOM node living in the page, passed back into page scripts"""
+
+    def __init__(self, object_id):
+        self.object_id = object_id
+
+
+def find_chrome():
+    """Locate a Chrome/Chromium executable, preferring $CHROME_PATH"""
+    if os.environ.get("CHROME_PATH"):
+        return os.environ["CHROME_PATH"]
+    for candidate in CHROME_CANDIDATES:
+        path = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if path:
+            return path
+    raise CDPError("Chrome not found. Install Chrome or set CHROME_PATH")
+
+
+class Browser:
+    """A locally launched Chrome and the single DevTools websocket all of its tabs share"""
+
+    def __init__(self, headless=True, executable=None, user_data_dir=None, startup_timeout=30):
+        self.headless = headless
+        self.executable = executable
+        self.user_data_dir = user_data_dir
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.temp_dir = None
+        self.websocket = None
+        self.reader = None
+        self.ids = itertools.count(1)
+        self.pending = {}
+        self.pages = {}  # session id -> Page
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self):
+        """Launch Chrome with remote debugging and connect to its browser endpoint"""
+        try:
+            await self.launch()
+        except BaseException:
+            # __aexit__ doesn't run when __aenter__ fails, so don't leave Chrome or its profile behind
+            await self.close()
+            raise
+
+    async def launch(self):
+        if not self.user_data_dir:
+            self.temp_dir = tempfile.mkdtemp(prefix="iut_chrome_")
+            self.user_data_dir = self.temp_dir
+
+        # Chrome writes the port it picked to DevToolsActivePort; remove a stale one first
+        port_file = os.path.join(self.user_data_dir, "DevToolsActivePort")
+        if os.path.exists(port_file):
+            os.remove(port_file)
+
+        args = [self.executable or find_chrome(),
+                "--remote-debugging-port=0",
+                f"--user-data-dir={self.user_data_dir}",
+                "--no-first-run",
+                "--no-default-browser-check",
+                "--disable-notifications",
+                "--disable-popup-blocking",
+                "--disable-blink-features=AutomationControlled",
+                # Tabs are scrolled concurrently, so background tabs must not be throttled
+                "--disable-background-timer-throttling",
+                "--disable-renderer-backgrounding",
+                "--disable-backgrounding-occluded-windows",
+                "--window-size=1920,1080"]
+        if self.headless:
+            args.append("--headless=new")
+        args.append("about:blank")
+        self.process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            if os.path.exists(port_file):
+                with open(port_file, 'r') as f:
+                    lines = f.read().split()
+                if len(lines) >= 2:
+                    break
+            if self.process.poll() is not None:
+                raise CDPError(f"Chrome exited during startup with code {self.process.returncode}")
+            if time.monotonic() > deadline:
+                raise CDPError("Timed out waiting for Chrome's DevTools port")
+            await asyncio.sleep(0.1)
+
+        self.websocket = await websockets.connect(f"ws://127.0.0.1:{lines[0]}{lines[1]}", max_size=None)
+        self.reader = asyncio.create_task(self.read_messages())
+
+    async def read_messages(self):
+        """Route command results to their callers and events to their tabs"""
+        try:
+            async for message in self.websocket:
+                data = json.loads(message)
+                if "id" in data:
+                    future = self.pending.pop(data["id"], None)
+                    if future and not future.done():
+                        if "error" in data:
+                            future.set_exception(CDPError(f"{data['error'].get('message')} ({data['error'].get('code')})"))
+                        else:
+                            future.set_result(data.get("result", {}))
+                elif data.get("sessionId") in self.pages:
+                    self.pages[data["sessionId"]].handle_event(data["method"], data.get("params", {}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(CDPError("DevTools connection closed"))
+            self.pending.clear()
+
+    async def send(self, method, params=None, session_id=None, timeout=60):
+        """Send one DevTools command and wait for its result"""
+        message_id = next(self.ids)
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self.pending[message_id] = future
+        await self.websocket.send(json.dumps(message))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.pending.pop(message_id, None)
+
+    async def new_context(self):
+        """Create an isolated browser context (its own cookies and storage), e.g. one per account"""
+        result = await self.send("Target.createBrowserContext", {"disposeOnDetach": True})
+        return result["browserContextId"]
+
+    async def new_page(self, context_id=None, lean=True):
+        """Open a tab, attach to it over the shared websocket and prepare it for scraping"""
+        params = {"url": "about:blank"}
+        if context_id:
+            params["browserContextId"] = context_id
+        target_id = (await self.send("Target.createTarget", params))["targetId"]
+        session_id = (await self.send("Target.attachToTarget", {"targetId": target_id, "flatten": True}))["sessionId"]
+        page = Page(self, target_id, session_id)
+        self.pages[session_id] = page
+        await page.setup(lean)
+        return page
+
+    async def close(self):
+        """Close Chrome and remove its temporary profile"""
+        asked_to_close = False
+        if self.websocket:
+            try:
+                await self.send("Browser.close", timeout=5)
+                asked_to_close = True
+            except Exception:
+                pass
+            await self.websocket.close()
+            self.websocket = None
+        if self.reader:
+            self.reader.cancel()
+            self.reader = None
+        if self.process:
+            if not asked_to_close and self.process.poll() is None:
+                self.process.terminate()
+            try:
+                await asyncio.to_thread(self.process.wait, timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                await asyncio.to_thread(self.process.wait)
+            self.process = None
+        if self.temp_dir:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            self.temp_dir = None
+
+
+class Page:
+    """One tab, driven through its flattened DevTools session"""
+
+    def __init__(self, browser, target_id, session_id):
+        self.browser = browser
+        self.target_id = target_id
+        self.session_id = session_id
+        self.waiters = {}  # event method -> futures waiting for it
+        self.global_object_id = None
+
+    async def send(self, method, params=None, timeout=60):
+        return await self.browser.send(method, params, self.session_id, timeout)
+
+    def handle_event(self, method, params):
+        if method == "Runtime.executionContextsCleared":
+            self.global_object_id = None
+        for future in self.waiters.pop(method, []):
+            if not future.done():
+                future.set_result(params)
+
+    def expect_event(self, method):
+        """Future for the next occurrence of an event; create it before triggering the event"""
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.setdefault(method, []).append(future)
+        return future
+
+    async def setup(self, lean=True):
+        await self.send("Page.enable")
+        await self.send("Runtime.enable")
+        await self.send("Page.addScriptToEvaluateOnNewDocument", {
+            "source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined});"
+        })
+        if lean:
+            await self.send("Network.enable")
+            await self.send("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+
+    async def navigate(self, url, timeout=30):
+        """Load url and wait for DOMContentLoaded (the eager strategy of the Selenium tracker)"""
+        loaded = self.expect_event("Page.domContentEventFired")
+        result = await self.send("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            raise CDPError(f"Navigation to {url} failed: {result['errorText']}")
+        await asyncio.wait_for(loaded, timeout)
+
+    async def evaluate(self, expression):
+        """Evaluate an expression and return its JSON value"""
+        result = await self.send("Runtime.evaluate", {"expression": expression, "returnByValue": True,
+                                                      "awaitPromise": True})
+        if result.get("exceptionDetails"):
+            raise CDPError(f"Script error: {result['exceptionDetails'].get('text')}")
+        return result["result"].get("value")
+
+    async def call(self, script, *args, async_script=False, handle=False):
+        """Run a Selenium-style script body (arguments[...] and return) in the page.
+
+        Element arguments are passed as ElementHandle. With async_script the last
+        argument is a callback, like Selenium's execute_async_script. With handle
+        the result is returned as an ElementHandle (or None) instead of a value.
+        """
+        if async_script:
+            declaration = ("function () { var args = Array.prototype.slice.call(arguments); var self = this; "
+                           "return new Promise(function (resolve) { args.push(resolve); "
+                           "(function () {" + script + "}).apply(self, args); }); }")
+        else:
+            declaration = "function () {" + script + "}"
+
+        if not self.global_object_id:
+            result = await self.send("Runtime.evaluate", {"expression": "globalThis"})
+            self.global_object_id = result["result"]["objectId"]
+
+        arguments = [{"objectId": arg.object_id} if isinstance(arg, ElementHandle) else {"value": arg}
+                     for arg in args]
+        result = await self.send("Runtime.callFunctionOn", {
+            "functionDeclaration": declaration, "objectId": self.global_object_id, "arguments": arguments,
+            "returnByValue": not handle, "awaitPromise": True,
+        })
+        if result.get("exceptionDetails"):
+            raise CDPError(f"Script error: {result['exceptionDetails'].get('text')}")
+        if handle:
+            object_id = result["result"].get("objectId")
+            return ElementHandle(object_id) if object_id and result["result"].get("subtype") != "null" else None
+        return result["result"].get("value")
+
+    async def find(self, xpath):
+        return await self.call(FIND_XPATH_JS, xpath, handle=True)
+
+    async def wait_for_xpath(self, xpath, timeout=10):
+        """Poll until an element matches xpath. Returns its handle, or None on timeout"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                element = await self.find(xpath)
+            except CDPError:
+                # The document was replaced mid-call by a navigation
+                element = None
+            if element or time.monotonic() > deadline:
+                return element
+            await asyncio.sleep(0.1)
+
+    async def click(self, element):
+        """Click the center of an element with real (trusted) mouse events"""
+        x, y = await self.call(ELEMENT_CENTER_JS, element)
+        for event in ("mouseMoved", "mousePressed", "mouseReleased"):
+            await self.send("Input.dispatchMouseEvent", {"type": event, "x": x, "y": y, "button": "left",
+                                                         "clickCount": 1})
+
+    async def type_text(self, element, text, min_delay=0.05, max_delay=0.15):
+        """Focus an element and type text one character at a time like a human"""
+        await self.call("arguments[0].focus(); arguments[0].value = '';", element)
+        for char in text:
+            await self.send("Input.insertText", {"text": char})
+            await asyncio.sleep(random.uniform(min_delay, max_delay))
+
+    async def press_escape(self):
+        for event in ("keyDown", "keyUp"):
+            await self.send("Input.dispatchKeyEvent", {"type": event, "key": "Escape", "code": "Escape",
+                                                       "windowsVirtualKeyCode": 27})
+
+    async def cookies(self):
+        return (await self.send("Network.getCookies"))["cookies"]
+
+    async def close(self):
+        self.browser.pages.pop(self.session_id, None)
+        try:
+            await self.browser.send("Target.closeTarget", {"targetId": self.target_id})
+        except CDPError:
+            pass
+
+
+class AsyncTracker:
+    """Coroutine counterpart of UnfollowTracker for one account, in its own browser context"""
+
+    def __init__(self, username, password, browser, lean=True):
+        self.URL = 'https://www.instagram.com/'
+        self.username = username
+        self.password = password
+        self.browser = browser
+        self.lean = lean
+        self.context_id = None
+        self.following_list = []
+        self.followers_list = []
+        self.not_following_back = []
+
+        self.scroll_delay = 2.0  # Longest wait for new rows after each scroll
+        self.stable_threshold = 10  # Scrolls without new usernames before stopping
+        self.scroll_timeout = 1000  # Max number of scrolls
+        self.use_session_cache = True
+
+        self.base_dir = "instagram_data"
+        self.json_dir = os.path.join(self.base_dir, "json_files")
+        self.sessions_dir = os.path.join(self.base_dir, "sessions")
+        os.makedirs(self.json_dir, exist_ok=True)
+        os.makedirs(self.sessions_dir, exist_ok=True)
+
+    async def new_page(self):
+        """Open a tab in this account's browser context"""
+        if not self.context_id:
+            self.context_id = await self.browser.new_context()
+        return await self.browser.new_page(self.context_id, self.lean)
+
+    def session_file(self):
+        """Same session file as UnfollowTracker, so either backend can reuse the other's login"""
+        return os.path.join(self.sessions_dir, f"{self.username}.json")
+
+    async def restore_session(self, page):
+        if not self.use_session_cache or not os.path.exists(self.session_file()):
+            return False
+        try:
+            with open(self.session_file(), 'r') as f:
+                session = json.load(f)
+        except Exception as e:
+            print(f"Could not read saved session: {e}")
+            return False
+        if session.get("url") != self.URL or not session.get("cookies"):
+            return False
+
+        cookies = []
+        for cookie in session["cookies"]:
+            param = {key: cookie[key] for key in ("name", "value", "domain", "path", "secure", "httpOnly")
+                     if key in cookie}
+            if "expiry" in cookie:
+                param["expires"] = cookie["expiry"]
+            if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+                param["sameSite"] = cookie["sameSite"]
+            if "domain" not in param:
+                param["url"] = self.URL
+            cookies.append(param)
+        await page.send("Network.setCookies", {"cookies": cookies})
+        print(f"Restored session saved at {session.get('saved_at')}")
+        return True
+
+    async def save_session(self, page):
+        try:
+            cookies = []
+            for cookie in await page.cookies():
+                saved = {key: cookie[key] for key in ("name", "value", "domain", "path", "secure", "httpOnly")}
+                if cookie.get("expires", -1) > 0:
+                    saved["expiry"] = int(cookie["expires"])
+                if cookie.get("sameSite"):
+                    saved["sameSite"] = cookie["sameSite"]
+                cookies.append(saved)
+            session = {"saved_at": datetime.now().isoformat(), "url": self.URL, "cookies": cookies,
+                       "local_storage": await page.call(LOCAL_STORAGE_JS)}
+            # The file holds live session cookies, so keep it private
+            fd = os.open(self.session_file(), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(session, f)
+        except Exception as e:
+            print(f"Could not save session: {e}")
+
+    async def is_logged_in(self, page):
+        if not any(cookie["name"] == "sessionid" for cookie in await page.cookies()):
+            return False
+        return not await page.evaluate("!!document.querySelector('input[name=\"password\"]')")
+
+    async def login(self, timeout=60):
+        """Log in, reusing a saved session when it is still valid. Never prompts"""
+        page = await self.new_page()
+        try:
+            if await self.restore_session(page):
+                await page.navigate(self.URL)
+                if await self.is_logged_in(page):
+                    print(f"[{self.username}] Saved session is still valid. Skipping login.")
+                    return True
+                print(f"[{self.username}] Saved session has expired. Logging in again...")
+                await page.send("Network.clearBrowserCookies")
+
+            await page.navigate(f"{self.URL}accounts/login/")
+            username_field = await page.wait_for_xpath('//input[@name="username"]', 15)
+            password_field = await page.wait_for_xpath('//input[@name="password"]', 5)
+            if not username_field or not password_field:
+                print(f"[{self.username}] Login form not found")
+                return False
+            await page.type_text(username_field, self.username)
+            await page.type_text(password_field, self.password)
+            await page.click(await page.wait_for_xpath('//button[@type="submit"]', 5))
+
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(1)
+                try:
+                    if await self.is_logged_in(page):
+                        print(f"[{self.username}] Login successful")
+                        await self.save_session(page)
+                        return True
+                except CDPError:
+                    # Still navigating
+                    continue
+            print(f"[{self.username}] Login timed out")
+            return False
+        finally:
+            await page.close()
+
+    async def read_count(self, page, kind):
+        """Follower/following count from the profile page, in one script call"""
+        selectors = [f'//a[contains(@href, "/{kind}")]/span/span | //a[contains(@href, "/{kind}")]/div/span',
+                     f'//a[contains(@href, "/{kind}")] | //div[contains(text(), " {kind}")]',
+                     f'//section//li[contains(., "{kind}")]']
+        max_plain = 100000 if kind == "following" else 1000000
+        for _, text in await page.call(PROFILE_COUNT_TEXTS_JS, selectors, kind, max_plain) or []:
+            count = count_from_text(text)
+            if count > 0:
+                return count
+        return 0
+
+    async def open_list_dialog(self, page, profile, kind):
+        """Navigate to a profile and open its followers/following dialog. Returns the scroll box handle"""
+        await page.navigate(f"{self.URL}{profile}/")
+        link = await page.wait_for_xpath(f'//a[contains(@href, "/{kind}")]', 15)
+        if not link:
+            return None
+        await page.click(link)
+        if not await page.wait_for_xpath('//div[@role="dialog"]', 15):
+            return None
+
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            scroll_box = await page.call(FIND_SCROLL_BOX_JS, SCROLL_BOX_XPATHS, handle=True)
+            if scroll_box:
+                return scroll_box
+            await asyncio.sleep(0.2)
+        return None
+
+    async def scrape_list(self, kind):
+        """Scroll our own followers/following dialog in a fresh tab and return the usernames in order"""
+        page = await self.new_page()
+        try:
+            await page.navigate(f"{self.URL}{self.username}/")
+            await page.wait_for_xpath(f'//a[contains(@href, "/{kind}")]', 15)
+            expected = await self.read_count(page, kind)
+            print(f"[{self.username}] Expecting about {expected} {kind}")
+
+            scroll_box = await self.open_list_dialog(page, self.username, kind)
+            if not scroll_box:
+                print(f"[{self.username}] Could not open the {kind} dialog")
+                return []
+
+            await page.evaluate("window.__iutSeenHrefs = {}; true")
+            usernames = list(usernames_from_hrefs(await page.call(HARVEST_LINKS_JS, scroll_box)))
+            seen = set(usernames)
+            stable_scrolls = 0
+            for scroll_count in range(1, self.scroll_timeout + 1):
+                before = await page.call(ROW_SIGNATURE_JS, scroll_box)
+                await page.call("arguments[0].scrollTop = arguments[0].scrollHeight", scroll_box)
+                await page.call(WAIT_FOR_ROWS_JS, scroll_box, int(self.scroll_delay * 1000), before,
+                                async_script=True)
+
+                new = [user for user in usernames_from_hrefs(await page.call(HARVEST_LINKS_JS, scroll_box))
+                       if user not in seen]
+                seen.update(new)
+                usernames.extend(new)
+                stable_scrolls = 0 if new else stable_scrolls + 1
+
+                if new and scroll_count % 5 == 0:
+                    print(f"[{self.username}] [{kind}] Scroll {scroll_count}: {len(usernames)} usernames collected")
+                if stable_scrolls >= self.stable_threshold:
+                    break
+                if expected and len(usernames) >= expected * 0.98:
+                    break
+
+            print(f"[{self.username}] Finished: {len(usernames)} {kind}")
+            self.save_list(kind, usernames)
+            return usernames
+        finally:
+            await page.close()
+
+    async def get_following(self):
+        self.following_list = await self.scrape_list("following")
+        return self.following_list
+
+    async def get_followers(self):
+        self.followers_list = await self.scrape_list("followers")
+        return self.followers_list
+
+    async def manually_verify_non_follower(self, username):
+        """Check in a separate tab whether username follows us. True means it does not"""
+        page = await self.new_page()
+        try:
+            await page.navigate(f"{self.URL}{username}/")
+            if await page.wait_for_xpath(
+                    '//h2[contains(text(), "Private")] | //div[contains(text(), "Private")] | '
+                    '//span[contains(text(), "Private")]', 1):
+                print(f"Account {username} is private. Cannot verify.")
+                return True
+
+            if await page.call(PAGE_CONTAINS_TEXT_JS, self.username):
+                print(f"Found username mention in {username}'s profile. Manual verification recommended.")
+
+            if not await self.open_list_dialog(page, username, "following"):
+                print(f"Could not open following list for {username}")
+                return True
+
+            search_box = await page.wait_for_xpath('//input[@placeholder="Search" or @aria-label="Search"]', 5)
+            if not search_box:
+                print(f"No search box in {username}'s following list. Assuming our list is correct.")
+                return True
+
+            for query in dict.fromkeys([self.username, self.username.lower()]):
+                await page.type_text(search_box, query)
+                match = await page.wait_for_xpath(f'//div[@role="dialog"]//a[contains(@href, "/{query}/")]', 3)
+                if match:
+                    print(f"VERIFICATION ERROR: {username} actually follows you!")
+                    return False
+
+            print(f"Verified: {username} does not follow you.")
+            return True
+        except Exception as e:
+            print(f"Error verifying {username}: {e}")
+            return True  # Assume our list is correct
+        finally:
+            await page.close()
+
+    async def verify_non_followers(self, usernames, concurrency=3):
+        """Verify several accounts at once, at most concurrency tabs at a time. Returns {username: verdict}"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def verify(user):
+            async with semaphore:
+                return user, await self.manually_verify_non_follower(user)
+
+        return dict(await asyncio.gather(*(verify(user) for user in usernames)))
+
+    def find_non_followers(self, use_normalized_comparison=True):
+        self.not_following_back = compute_non_followers(self.following_list, self.followers_list,
+                                                        use_normalized_comparison)
+        self.save_list("non_followers", self.not_following_back)
+        return self.not_following_back
+
+    def save_list(self, list_type, usernames):
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_file = f"{self.json_dir}/{self.username}_{list_type}_{timestamp}.json"
+        with open(output_file, 'w') as f:
+            json.dump(usernames, f)
+        return output_file
+
+
+async def scan(args):
+    async with Browser(headless=args.headless) as browser:
+        tracker = AsyncTracker(args.username, args.password, browser, lean=not args.no_lean)
+        if args.url:
+            tracker.URL = args.url.rstrip("/") + "/"
+        tracker.scroll_delay = args.scroll_delay
+        tracker.stable_threshold = args.stable_threshold
+        tracker.use_session_cache = not args.no_session_cache
+
+        if not await tracker.login():
+            print("Login failed. Exiting.")
+            return
+
+        # Both lists are scrolled at the same time, each in its own tab
+        started = time.perf_counter()
+        await asyncio.gather(tracker.get_following(), tracker.get_followers())
+        print(f"Extracted both lists in {time.perf_counter() - started:.1f}s")
+
+        non_followers = tracker.find_non_followers()
+        print("\n===== ACCOUNTS NOT FOLLOWING YOU BACK =====")
+        for i, user in enumerate(non_followers, 1):
+            print(f"{i}. {user}")
+        print(f"\nTotal: {len(non_followers)} accounts")
+
+        if args.verify_count and non_followers:
+            sample = random.sample(non_followers, min(args.verify_count, len(non_followers)))
+            verdicts = await tracker.verify_non_followers(sample, args.concurrency)
+            confirmed = sum(1 for verdict in verdicts.values() if verdict)
+            print(f"\nVerified {confirmed}/{len(sample)} non-followers")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Instagram Followers Analysis Tool (asyncio DevTools backend)")
+    parser.add_argument("--username", required=True, help="Your Instagram username")
+    parser.add_argument("--password", required=True, help="Your Instagram password")
+    parser.add_argument("--headless", action="store_true", help="Run Chrome without a window")
+    parser.add_argument("--no-lean", action="store_true", help="Load images, video and analytics")
+    parser.add_argument("--no-session-cache", action="store_true", help="Always log in with credentials")
+    parser.add_argument("--scroll-delay", type=float, default=2.0,
+                        help="Longest wait for new rows after each scroll in seconds (default: 2.0)")
+    parser.add_argument("--stable-threshold", type=int, default=10,
+                        help="Scrolls without new usernames before stopping (default: 10)")
+    parser.add_argument("--verify-count", type=int, default=0, help="Non-followers to verify (default: 0)")
+    parser.add_argument("--concurrency", type=int, default=3, help="Tabs verifying at once (default: 3)")
+    parser.add_argument("--url", help="Base URL to scrape (default: Instagram; point at mock_instagram.py to test)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(scan(args))
+    except KeyboardInterrupt:
+        print("\nOperation cancelled by user.")
+
+
+if __name__ == "__main__":
+    main()
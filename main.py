@@ -1,23 +1,794 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, StaleElementReferenceException
 import time
 import random
 import json
+import base64
 from datetime import datetime
 import re
 import os
 import argparse
+import socket
+import secrets
+import threading
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import queue
+import collections
+import requests
+from requests.adapters import HTTPAdapter
+
+from analysis import (OUTPUT_FORMATS, ListWriter, SnapshotStore, compute_non_followers, count_from_text,
+                      count_precision, is_valid_username, iter_usernames, latest_list_file, normalize_username,
+                      print_history_report, username_from_href, usernames_from_hrefs)
+
+# Selenium is imported by load_selenium() when the first browser starts, so
+# offline analysis works without it
+webdriver = None
+By = None
+Keys = None
+WebDriverWait = None
+EC = None
+NoSuchElementException = None
+TimeoutException = None
+StaleElementReferenceException = None
+
+
+def load_selenium():
+    """Import Selenium into the module globals"""
+    global webdriver, By, Keys, WebDriverWait, EC
+    global NoSuchElementException, TimeoutException, StaleElementReferenceException
+    if webdriver is not None:
+        return
+
+    from selenium import webdriver as selenium_webdriver
+    from selenium.webdriver.common.by import By as selenium_by
+    from selenium.webdriver.common.keys import Keys as selenium_keys
+    from selenium.webdriver.support.ui import WebDriverWait as selenium_wait
+    from selenium.webdriver.support import expected_conditions
+    from selenium.common import exceptions
+
+    By = selenium_by
+    Keys = selenium_keys
+    WebDriverWait = selenium_wait
+    EC = expected_conditions
+    NoSuchElementException = exceptions.NoSuchElementException
+    TimeoutException = exceptions.TimeoutException
+    StaleElementReferenceException = exceptions.StaleElementReferenceException
+    webdriver = selenium_webdriver
+
+
+# Collects every profile link inside the dialog in a single round trip.
+# Hrefs already handed back are remembered on the page, so each call
+# returns only rows that appeared since the previous scroll.
+HARVEST_LINKS_JS = """
+var box = arguments[0];
+var seen = window.__iutSeenHrefs || (window.__iutSeenHrefs = {});
+var skip = ['/p/', '/explore/', '/reels/', '/stories/', '/direct/', '/tags/'];
+var links = box.querySelectorAll('a[href*="/"]');
+var fresh = [];
+for (var i = 0; i < links.length; i++) {
+    var href = links[i].href;
+    if (!href || seen[href]) continue;
+    seen[href] = true;
+    var blocked = false;
+    for (var j = 0; j < skip.length; j++) {
+        if (href.indexOf(skip[j]) !== -1) { blocked = true; break; }
+    }
+    if (!blocked) fresh.push(href);
+}
+return fresh;
+"""
+
+# Installs a MutationObserver on the dialog that pushes every newly inserted
+# (or re-targeted, when rows are recycled) profile link into window.__iutBuffer.
+INSTALL_OBSERVER_JS = """
+var box = arguments[0];
+if (window.__iutObserver) window.__iutObserver.disconnect();
+var seen = window.__iutSeenHrefs || (window.__iutSeenHrefs = {});
+var buffer = window.__iutBuffer = [];
+var skip = ['/p/', '/explore/', '/reels/', '/stories/', '/direct/', '/tags/'];
+function queueLink(link) {
+    var href = link.href;
+    if (!href || seen[href]) return;
+    seen[href] = true;
+    for (var j = 0; j < skip.length; j++) {
+        if (href.indexOf(skip[j]) !== -1) return;
+    }
+    buffer.push(href);
+}
+function queueNode(node) {
+    if (!node || node.nodeType !== 1) return;
+    if (node.tagName === 'A') queueLink(node);
+    var links = node.querySelectorAll('a[href*="/"]');
+    for (var i = 0; i < links.length; i++) queueLink(links[i]);
+}
+window.__iutObserver = new MutationObserver(function (mutations) {
+    for (var m = 0; m < mutations.length; m++) {
+        var mutation = mutations[m];
+        if (mutation.type === 'attributes') {
+            queueNode(mutation.target);
+            continue;
+        }
+        for (var n = 0; n < mutation.addedNodes.length; n++) queueNode(mutation.addedNodes[n]);
+    }
+});
+window.__iutObserver.observe(box, {childList: true, subtree: true, attributes: true, attributeFilter: ['href']});
+queueNode(box);
+return buffer.length;
+"""
+
+# Async script: resolves as soon as the observer has queued rows (after a
+# short quiet period so one page arrives as one batch) or when the timeout passes.
+DRAIN_OBSERVED_LINKS_JS = """
+var timeoutMs = arguments[0];
+var done = arguments[arguments.length - 1];
+var started = Date.now();
+var lastSize = -1;
+function poll() {
+    var buffer = window.__iutBuffer || [];
+    var elapsed = Date.now() - started;
+    if ((buffer.length && buffer.length === lastSize) || elapsed >= timeoutMs) {
+        // Empty in place: the observer keeps pushing into this same array
+        done(buffer.splice(0));
+        return;
+    }
+    lastSize = buffer.length;
+    setTimeout(poll, buffer.length ? 100 : 50);
+}
+poll();
+"""
+
+# Removes dialog rows whose links have all been harvested (every row when arguments[2] is true),
+# keeping the last arguments[1] rows. A spacer at the top of the row container takes over their
+# height, so the scroll position and scrollHeight don't change and pagination keeps firing.
+# Returns the number of rows removed.
+PRUNE_HARVESTED_ROWS_JS = """
+var box = arguments[0], keep = arguments[1], pruneAll = arguments[2];
+var seen = window.__iutSeenHrefs || {};
+var links = box.querySelectorAll('a[href*="/"]');
+if (links.length < 2) return 0;
+
+// The row container is the closest element holding both the first and the last row
+var ancestors = [];
+for (var node = links[0]; node; node = node.parentElement) ancestors.push(node);
+var container = links[links.length - 1];
+while (container && ancestors.indexOf(container) === -1) container = container.parentElement;
+if (!container || container === links[0]) return 0;
+
+var spacer = container.querySelector(':scope > [data-iut-spacer]');
+if (!spacer) {
+    spacer = document.createElement('div');
+    spacer.setAttribute('data-iut-spacer', '');
+    spacer.style.height = '0px';
+    container.insertBefore(spacer, container.firstChild);
+}
+
+// Only children with profile links are rows; headers, spinners and the page's own spacers stay
+var rows = [];
+for (var i = 0; i < container.children.length; i++) {
+    var child = container.children[i];
+    if (child !== spacer && child.querySelector('a[href*="/"]')) rows.push(child);
+}
+var removed = 0, height = 0;
+for (var r = 0; r < rows.length - keep; r++) {
+    var row = rows[r];
+    var rowLinks = row.querySelectorAll('a[href*="/"]');
+    var harvested = true;
+    for (var k = 0; k < rowLinks.length && !pruneAll; k++) {
+        if (!seen[rowLinks[k].href]) { harvested = false; break; }
+    }
+    // Stop at the first row that hasn't been read yet
+    if (!harvested) break;
+    height += row.getBoundingClientRect().height;
+    row.remove();
+    removed++;
+}
+spacer.style.height = (parseFloat(spacer.style.height) + height) + 'px';
+return removed;
+"""
+
+# Friendship list endpoints the following/followers dialog pages through
+# The first group of each pattern is the list type. GraphQL URLs don't name the
+# query, so those responses are filtered by shape in parse_user_records instead.
+USER_LIST_URL_PATTERNS = [
+    r'/api/v1/friendships/[^/]+/(following|followers)/',
+    r'/graphql/query()',
+]
+
+# GraphQL connection that holds each list; other connections (e.g. suggested accounts) are ignored
+LIST_EDGE_KEYS = {
+    "following": ("edge_follow",),
+    "followers": ("edge_followed_by",),
+}
+
+
+def parse_user_records(payload, list_type=None):
+    """Return (username, user_id) pairs from a friendships REST page or a GraphQL edge list.
+
+    With list_type, only the GraphQL connection for that list is read.
+    """
+    records = []
+    if not isinstance(payload, dict):
+        return records
+
+    # REST pagination: {"users": [{"pk": ..., "username": ...}], "next_max_id": ...}
+    users = payload.get("users")
+    if isinstance(users, list):
+        for user in users:
+            if isinstance(user, dict) and user.get("username"):
+                records.append((user["username"], user.get("pk") or user.get("pk_id") or user.get("id")))
+        return records
+
+    # GraphQL: {"data": {"user": {"edge_follow": {"edges": [{"node": {...}}]}}}}
+    edge_keys = LIST_EDGE_KEYS.get(list_type) or sum(LIST_EDGE_KEYS.values(), ())
+
+    def walk(node):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key in edge_keys and isinstance(value, dict):
+                    for edge in value.get("edges") or []:
+                        user = edge.get("node") if isinstance(edge, dict) else None
+                        if isinstance(user, dict) and user.get("username"):
+                            records.append((user["username"], user.get("id") or user.get("pk")))
+                else:
+                    walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    walk(payload.get("data", payload))
+    return records
+
+
+# Summary of the dialog content (height, link count and last link), taken right before a scroll
+ROW_SIGNATURE_JS = """
+var box = arguments[0];
+var links = box.querySelectorAll('a[href]');
+return box.scrollHeight + ':' + links.length + ':' + (links.length ? links[links.length - 1].href : '');
+"""
+
+# Async script: resolves with the milliseconds until the dialog content differs from
+# the ROW_SIGNATURE_JS value in arguments[2], or -1 on timeout.
+WAIT_FOR_ROWS_JS = """
+var box = arguments[0];
+var timeoutMs = arguments[1];
+var before = arguments[2];
+var done = arguments[arguments.length - 1];
+function signature() {
+    var links = box.querySelectorAll('a[href]');
+    return box.scrollHeight + ':' + links.length + ':' + (links.length ? links[links.length - 1].href : '');
+}
+var started = Date.now();
+function poll() {
+    var now = signature();
+    var elapsed = Date.now() - started;
+    if (before === null || before === undefined || now !== before) {
+        done(elapsed);
+    } else if (elapsed >= timeoutMs) {
+        done(-1);
+    } else {
+        setTimeout(poll, 50);
+    }
+}
+poll();
+"""
+
+# Requests dropped in lean mode: avatars, post media and analytics beacons (CDP wildcard patterns)
+LEAN_BLOCKED_URLS = [
+    "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.heic*", "*.ico*",
+    "*.mp4*", "*.m4v*", "*.webm*", "*.mov*", "*.m4a*",
+    "*/logging/*", "*/ajax/bz*", "*graph.instagram.com/logging*",
+    "*google-analytics.com*", "*googletagmanager.com*", "*connect.facebook.net*",
+]
+
+STOP_OBSERVER_JS = """
+if (window.__iutObserver) { window.__iutObserver.disconnect(); window.__iutObserver = null; }
+window.__iutBuffer = [];
+"""
+
+# Collects candidate count texts for arguments[1] ("following"/"followers") in one round trip.
+# The XPath selectors in arguments[0] are tried in order; only if none of them matches a text
+# with a number in it are the page's text nodes scanned for short elements mentioning the keyword. A plain number counts as a
+# candidate when it is below arguments[2].
+# Returns [selector index or -1, text] pairs.
+PROFILE_COUNT_TEXTS_JS = """
+var selectors = arguments[0], keyword = arguments[1].toLowerCase(), maxPlain = arguments[2];
+var texts = [], limit = 50, numeric = false;
+function consider(el, index) {
+    var text = (el.innerText || el.textContent || '').trim();
+    if (!text) return;
+    var plain = /^\\d+$/.test(text) && parseInt(text, 10) > 0 && parseInt(text, 10) < maxPlain;
+    if (plain || text.toLowerCase().indexOf(keyword) !== -1) {
+        texts.push([index, text]);
+        numeric = numeric || /\\d/.test(text);
+    }
+}
+for (var i = 0; i < selectors.length && texts.length < limit; i++) {
+    var result;
+    try {
+        result = document.evaluate(selectors[i], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    } catch (e) { continue; }
+    for (var j = 0; j < result.snapshotLength && texts.length < limit; j++) consider(result.snapshotItem(j), i);
+}
+if (numeric || !document.body) return texts;
+// Labels without a number (e.g. a bare "Following") can't give a count, so start over
+texts = [];
+// Fallback: walk the text nodes (leaves) once and take the short element around each mention
+var walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT, null, false);
+var node;
+while ((node = walker.nextNode()) && texts.length < limit) {
+    if (node.data.length > 200 || node.data.toLowerCase().indexOf(keyword) === -1) continue;
+    var el = node.parentElement;
+    if (!el || el.tagName === 'SCRIPT' || el.tagName === 'STYLE') continue;
+    var text = (el.textContent || '').trim();
+    // The number is often in a sibling element, so look one level up when this one has none
+    if (!/\\d/.test(text) && el.parentElement && (el.parentElement.textContent || '').length <= 100) {
+        text = el.parentElement.textContent.trim();
+    }
+    if (text.length <= 100) texts.push([-1, text]);
+}
+return texts;
+"""
+
+PAGE_CONTAINS_TEXT_JS = """
+var text = (document.body && document.body.innerText) || '';
+return text.toLowerCase().indexOf(arguments[0].toLowerCase()) !== -1;
+"""
+
+
+class Instrumentation:
+    """Counts and times WebDriver commands, sleeps and tracker methods for a per-run report.
+
+    Time inside each tracked method is split into sleeping, WebDriver round
+    trips and the remainder (Python processing). Nested calls are charged to
+    the innermost tracked method, so the per-phase numbers add up to the run.
+    """
+
+    TRACKED_METHODS = ("login", "ensure_logged_in", "get_following", "get_followers", "get_following_api",
+                       "get_followers_api", "get_following_alternative", "get_followers_alternative",
+                       "scrape_users_from_dialog", "find_non_followers", "verify_non_followers",
+                       "manually_verify_non_follower", "verify_profile", "read_profile_count",
+                       "page_contains_text", "take_screenshot")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.started = time.time()
+        self.phases = {}
+        self.commands = {}
+        self.webdriver_calls = 0
+
+    def attach(self, tracker):
+        """Wrap a tracker's sleep helper and tracked methods, and its driver once it is running"""
+        # A tracker that hasn't started its browser yet attaches the driver in start_browser()
+        if tracker._driver is not None:
+            self.attach_driver(tracker._driver)
+
+        original_sleep = tracker.random_sleep
+
+        def random_sleep(min_time=1, max_time=3):
+            started = time.perf_counter()
+            try:
+                return original_sleep(min_time, max_time)
+            finally:
+                self.add_to_phase("sleep_seconds", time.perf_counter() - started)
+
+        tracker.random_sleep = random_sleep
+
+        for name in self.TRACKED_METHODS:
+            setattr(tracker, name, self.track(name, getattr(tracker, name)))
+
+    def attach_driver(self, driver):
+        """Count and time every WebDriver command sent by driver"""
+        original_execute = driver.execute
+
+        def execute(driver_command, params=None):
+            started = time.perf_counter()
+            try:
+                return original_execute(driver_command, params)
+            finally:
+                self.record_command(driver_command, time.perf_counter() - started)
+
+        driver.execute = execute
+
+    def stack(self):
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    def current_phase(self):
+        stack = self.stack()
+        return stack[-1]["name"] if stack else "other"
+
+    def phase_totals(self, name):
+        return self.phases.setdefault(name, {"calls": 0, "wall_seconds": 0.0, "self_seconds": 0.0,
+                                             "sleep_seconds": 0.0, "webdriver_seconds": 0.0,
+                                             "webdriver_calls": 0})
+
+    def add_to_phase(self, key, amount):
+        with self.lock:
+            self.phase_totals(self.current_phase())[key] += amount
+
+    def record_command(self, command, seconds):
+        phase = self.current_phase()
+        with self.lock:
+            self.webdriver_calls += 1
+            totals = self.phase_totals(phase)
+            totals["webdriver_calls"] += 1
+            totals["webdriver_seconds"] += seconds
+            command_totals = self.commands.setdefault(phase, {}).setdefault(command, {"count": 0, "seconds": 0.0})
+            command_totals["count"] += 1
+            command_totals["seconds"] += seconds
+
+    def track(self, name, method):
+        """Wrap a method so time spent in it is reported under its name"""
+        def tracked(*args, **kwargs):
+            stack = self.stack()
+            frame = {"name": name, "started": time.perf_counter(), "children": 0.0}
+            stack.append(frame)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                stack.pop()
+                elapsed = time.perf_counter() - frame["started"]
+                if stack:
+                    stack[-1]["children"] += elapsed
+                with self.lock:
+                    totals = self.phase_totals(name)
+                    totals["calls"] += 1
+                    totals["wall_seconds"] += elapsed
+                    totals["self_seconds"] += elapsed - frame["children"]
+        return tracked
+
+    def report(self):
+        """Summarize the run as a JSON-serializable dict"""
+        wall = time.time() - self.started
+        with self.lock:
+            phases = {}
+            for name, totals in self.phases.items():
+                phase = {key: round(value, 4) if isinstance(value, float) else value for key, value in totals.items()}
+                if name != "other":
+                    phase["python_seconds"] = round(
+                        max(totals["self_seconds"] - totals["sleep_seconds"] - totals["webdriver_seconds"], 0), 4)
+                phases[name] = phase
+
+            sleep = sum(totals["sleep_seconds"] for totals in self.phases.values())
+            webdriver_time = sum(totals["webdriver_seconds"] for totals in self.phases.values())
+            commands = {phase: {command: {"count": totals["count"], "seconds": round(totals["seconds"], 4)}
+                                for command, totals in by_command.items()}
+                        for phase, by_command in self.commands.items()}
+
+        return {
+            "started_at": datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+            "wall_seconds": round(wall, 3),
+            "totals": {
+                "sleep_seconds": round(sleep, 3),
+                "webdriver_seconds": round(webdriver_time, 3),
+                "python_seconds": round(max(wall - sleep - webdriver_time, 0), 3),
+                "webdriver_calls": self.webdriver_calls,
+            },
+            "phases": phases,
+            "commands_by_phase": commands,
+        }
+
+    def write_report(self, directory, fmt="json"):
+        """Write the report as JSON or as a Prometheus textfile. Returns the file path"""
+        os.makedirs(directory, exist_ok=True)
+        report = self.report()
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+        if fmt == "prometheus":
+            lines = [
+                "# HELP instagram_tracker_seconds Time spent per phase, split by kind.",
+                "# TYPE instagram_tracker_seconds gauge",
+            ]
+            for phase, totals in report["phases"].items():
+                for kind in ("sleep", "webdriver", "python"):
+                    if f"{kind}_seconds" in totals:
+                        lines.append(f'instagram_tracker_seconds{{phase="{phase}",kind="{kind}"}} '
+                                     f'{totals[kind + "_seconds"]}')
+            lines += [
+                "# HELP instagram_tracker_webdriver_commands_total WebDriver commands per phase and command.",
+                "# TYPE instagram_tracker_webdriver_commands_total counter",
+            ]
+            for phase, commands in report["commands_by_phase"].items():
+                for command, totals in commands.items():
+                    lines.append(f'instagram_tracker_webdriver_commands_total{{phase="{phase}",command="{command}"}} '
+                                 f'{totals["count"]}')
+            lines += [
+                "# HELP instagram_tracker_run_seconds Wall-clock duration of the run.",
+                "# TYPE instagram_tracker_run_seconds gauge",
+                f'instagram_tracker_run_seconds {report["wall_seconds"]}',
+            ]
+            path = os.path.join(directory, f"run_{timestamp}.prom")
+            with open(path, 'w') as f:
+                f.write("\n".join(lines) + "\n")
+        else:
+            path = os.path.join(directory, f"run_{timestamp}.json")
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+
+        totals = report["totals"]
+        print(f"Run metrics: {report['wall_seconds']:.1f}s total, {totals['sleep_seconds']:.1f}s sleeping, "
+              f"{totals['webdriver_seconds']:.1f}s in {totals['webdriver_calls']} WebDriver calls, "
+              f"{totals['python_seconds']:.1f}s other")
+        print(f"Metrics saved to {path}")
+        return path
+
+
+class ScrollPacer:
+    """Adapts the delay between scrolls to how quickly new rows actually load.
+
+    Additive-increase/multiplicative-decrease on the scroll rate: every scroll
+    that brings rows trims the delay by a fixed step (never below the measured
+    load time plus a margin), and every scroll that brings nothing multiplies
+    it, all within [min_delay, max_delay].
+    """
+
+    def __init__(self, initial_delay, min_delay=0.2, max_delay=8.0, step=0.25, backoff=1.5, margin=1.25):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.delay = min(max(initial_delay, min_delay), max_delay)
+        self.step = step
+        self.backoff = backoff
+        self.margin = margin
+        self.latencies = []
+
+    def record(self, latency):
+        """Update the delay from one scroll: latency in seconds, or None if no rows appeared"""
+        if latency is None:
+            self.delay = min(self.max_delay, self.delay * self.backoff)
+            return self.delay
+
+        self.latencies.append(latency)
+        self.delay = max(self.min_delay, latency * self.margin, self.delay - self.step)
+        return self.delay
+
+    def average_latency(self):
+        return sum(self.latencies) / len(self.latencies) if self.latencies else 0.0
+
+
+class RateLimiter:
+    """Spaces operations from any number of threads at least interval seconds apart"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def write_json_atomic(path, data):
+    """Write JSON through a uniquely named temp file, so concurrent writers never share one"""
+    fd, temp_file = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".",
+                                     suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(temp_file, path)
+    except BaseException:
+        try:
+            os.remove(temp_file)
+        except OSError:
+            pass
+        raise
+
+
+class VerificationCache:
+    """On-disk cache of verification verdicts keyed by (our username, target username).
+
+    Use VerificationCache.shared() so that trackers running in the same process
+    (batch accounts, verification workers) update one instance instead of
+    overwriting each other's file.
+    """
+
+    instances = {}
+    instances_lock = threading.Lock()
+
+    def __init__(self, path, ttl_seconds=7 * 24 * 3600, max_entries=10000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                print(f"Could not read verification cache: {e}")
+
+    @classmethod
+    def shared(cls, path, ttl_seconds=7 * 24 * 3600, max_entries=10000):
+        """The process-wide cache for path, loaded on first use"""
+        path = os.path.abspath(path)
+        with cls.instances_lock:
+            cache = cls.instances.get(path)
+            if cache is None:
+                cache = cls.instances[path] = cls(path, ttl_seconds, max_entries)
+            cache.ttl_seconds = ttl_seconds
+            cache.max_entries = max_entries
+            return cache
+
+    @staticmethod
+    def key(owner, target):
+        return f"{owner.lower()}:{target.lower()}"
+
+    def get(self, owner, target):
+        """Return the cached entry if it is younger than the TTL, else None"""
+        with self.lock:
+            entry = self.entries.get(self.key(owner, target))
+        if entry and time.time() - entry["checked_at"] < self.ttl_seconds:
+            return entry
+        return None
+
+    def put(self, owner, target, non_follower, private=False):
+        with self.lock:
+            self.entries[self.key(owner, target)] = {"non_follower": non_follower, "private": private,
+                                                     "checked_at": time.time()}
+
+    def save(self):
+        """Drop expired entries, evict the oldest beyond max_entries and write the cache"""
+        with self.lock:
+            now = time.time()
+            entries = {key: entry for key, entry in self.entries.items()
+                       if now - entry["checked_at"] < self.ttl_seconds}
+            if len(entries) > self.max_entries:
+                newest = sorted(entries.items(), key=lambda item: item[1]["checked_at"], reverse=True)
+                entries = dict(newest[:self.max_entries])
+            self.entries = entries
+            write_json_atomic(self.path, entries)
+
+
+class ScreenshotWriter:
+    """Writes screenshots on a background thread, keeping at most max_files in the directory"""
+
+    EXTENSIONS = (".png", ".jpeg", ".jpg", ".webp")
+
+    def __init__(self, directory, max_files=200):
+        self.directory = directory
+        self.max_files = max_files
+        self.queue = queue.Queue()
+
+        # Files left by earlier runs count towards the limit, oldest first
+        existing = [os.path.join(directory, name) for name in os.listdir(directory)
+                    if name.lower().endswith(self.EXTENSIONS)]
+        self.files = collections.deque(sorted(existing, key=os.path.getmtime))
+
+        self.thread = threading.Thread(target=self.run, name="screenshot-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, filename, data):
+        """Queue base64-encoded image data to be written to filename"""
+        self.queue.put((filename, data))
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            filename, data = item
+            try:
+                with open(filename, 'wb') as f:
+                    f.write(base64.b64decode(data))
+                print(f"Screenshot saved: {filename}")
+
+                # An overwritten file must not stay queued for deletion under its old position
+                if filename in self.files:
+                    self.files.remove(filename)
+                self.files.append(filename)
+                while len(self.files) > self.max_files:
+                    oldest = self.files.popleft()
+                    if os.path.exists(oldest):
+                        os.remove(oldest)
+            except Exception as e:
+                print(f"Error writing screenshot {filename}: {e}")
+
+    def close(self):
+        """Write everything still queued and stop the thread"""
+        self.queue.put(None)
+        self.thread.join()
+
+
+class StrategyRegistry:
+    """Remembers which selector or click strategy worked on each page type, and how fast.
+
+    Strategies are identified by their XPath. The most recent winner for a page
+    type is tried first unless it has failed since, followed by the others in
+    order of wins minus failures. Use StrategyRegistry.shared() so trackers in
+    the same process update one registry.
+    """
+
+    instances = {}
+    instances_lock = threading.Lock()
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                print(f"Could not read strategy registry: {e}")
+
+    @classmethod
+    def shared(cls, path):
+        """The process-wide registry for path, loaded on first use"""
+        path = os.path.abspath(path)
+        with cls.instances_lock:
+            if path not in cls.instances:
+                cls.instances[path] = cls(path)
+            return cls.instances[path]
+
+    def winner(self, page_type):
+        """The strategy that succeeded most recently on this page type and hasn't failed since, or None"""
+        with self.lock:
+            stats = self.entries.get(page_type)
+            if not stats:
+                return None
+            best = max(stats, key=lambda strategy: stats[strategy].get("last_win", 0))
+            entry = stats[best]
+            if entry.get("last_win", 0) <= entry.get("last_failure", 0):
+                return None
+            return best
+
+    def order(self, page_type, items, key=lambda item: item):
+        """Sort items so the winner comes first, then by wins minus failures; ties keep their original order"""
+        winner = self.winner(page_type)
+        with self.lock:
+            stats = self.entries.get(page_type, {})
+
+            def score(item):
+                entry = stats.get(key(item), {})
+                return entry.get("wins", 0) - entry.get("failures", 0)
+
+            return sorted(items, key=lambda item: (key(item) != winner, -score(item)))
+
+    def entry(self, page_type, strategy):
+        entry = self.entries.setdefault(page_type, {}).setdefault(strategy, {})
+        for field, default in (("wins", 0), ("failures", 0), ("seconds", 0.0), ("last_win", 0), ("last_failure", 0)):
+            entry.setdefault(field, default)
+        return entry
+
+    def record(self, page_type, strategy, seconds):
+        """Record a confirmed success and persist the registry"""
+        with self.lock:
+            entry = self.entry(page_type, strategy)
+            entry["seconds"] = (entry["seconds"] * entry["wins"] + seconds) / (entry["wins"] + 1)
+            entry["wins"] += 1
+            entry["last_win"] = time.time()
+            self.save()
+
+    def record_failure(self, page_type, strategy):
+        """Record that a strategy didn't work, so it drops behind the others, and persist the registry"""
+        with self.lock:
+            entry = self.entry(page_type, strategy)
+            entry["failures"] += 1
+            entry["last_failure"] = time.time()
+            self.save()
+
+    def save(self):
+        # Called with the lock held
+        try:
+            write_json_atomic(self.path, self.entries)
+        except Exception as e:
+            print(f"Could not save strategy registry: {e}")
 
 
 class UnfollowTracker:
-    def __init__(self, username, password, headless=False):
+    def __init__(self, username, password, headless=False, capture_network=False, profile_dir=None, lean=True):
         self.URL = 'https://www.instagram.com/'
         self.username = username
         self.password = password
+        self.headless = headless
         self.following_list = []
         self.followers_list = []
         self.not_following_back = []
@@ -26,16 +797,114 @@ class UnfollowTracker:
         self.scroll_timeout = 1000  # Max number of scrolls
         self.stable_threshold = 10  # Number of stable scrolls before stopping
         self.scroll_delay = 2.0  # Default delay between scrolls
+        self.harvest_mode = "js"  # "js" (one script per scroll), "observer" (MutationObserver), "network" or "webdriver"
+        self.checkpoint_interval = 25  # Scrolls between checkpoints of the partial list
+        self.resume = False  # Seed the scrape from a saved checkpoint
+        self.adaptive_pacing = False  # Tune the scroll delay to observed load times
+        self.min_scroll_delay = 0.2
+        self.max_scroll_delay = 8.0
+        self.prune_rows = False  # Remove harvested rows from the dialog to keep the browser's memory flat
+        self.prune_keep = 30  # Rows left at the bottom of the dialog when pruning
+        self.row_latency = None  # Average seconds from scroll to new rows in the last adaptive scrape
+        self.incremental = False  # Stop scrolling once the newest rows reach the previous snapshot
+        self.incremental_overlap = 30  # Consecutive already-known usernames that mark the end of the new rows
+        self.incremental_tolerance = 0  # Allowed difference between the merged list and the profile count
+        self.count_precision = {}  # Rounding of each profile count, e.g. 100 for '12.3K'
+        self.count_strategies = {}  # Selector, seconds and count behind each profile count, until a scrape confirms it
+
+        # Verification concurrency
+        self.verify_workers = 1  # Browsers used to verify non-followers
+        self.verify_interval = 2.0  # Minimum seconds between verification starts across all browsers
+
+        # Network capture reads list pages straight from the browser's performance log
+        self.capture_network = capture_network
+        self.capture_dir = None  # When set, matched response bodies are recorded here as fixtures
+        self.capture_counter = 0
+        self.pending_responses = {}
+        self.user_ids = {}  # username -> Instagram user id, filled by network capture
+
+        # Direct API fetching (reuses the browser session after login)
+        self.api_base_url = self.URL  # Point at a local mock server for testing
+        self.api_app_id = "936619815971160"
+        self.api_page_size = 200
+        self.api_request_delay = 1.0  # Minimum seconds between page requests
+        self.api_max_retries = 3
+        self.api_session = None
 
         # Create organized output directories
         self.base_dir = "instagram_data"
         self.screenshots_dir = os.path.join(self.base_dir, "screenshots")
         self.json_dir = os.path.join(self.base_dir, "json_files")
+        self.sessions_dir = os.path.join(self.base_dir, "sessions")
+        self.checkpoints_dir = os.path.join(self.base_dir, "checkpoints")
+        self.history_file = os.path.join(self.base_dir, "history.sqlite3")
+
+        # Verification results are cached between runs
+        self.use_verification_cache = True
+        self.verification_cache_file = os.path.join(self.base_dir, "verification_cache.json")
+        self.verify_cache_ttl = 7 * 24 * 3600  # Seconds before a verdict is checked again
+        self.verify_cache_size = 10000  # Maximum cached verdicts
+
+        # Which selectors and click strategies worked before, so they are tried first
+        self.strategies = StrategyRegistry.shared(os.path.join(self.base_dir, "strategies.json"))
+        self.settle_timeout = 10  # Seconds to wait for a known element before falling back to a fixed sleep
+        self.metrics_dir = os.path.join(self.base_dir, "metrics")
+
+        # Lists are saved as one JSON array, or streamed as NDJSON while they are harvested
+        self.output_format = "json"
+        self.list_writers = {}
+        self.instrumentation = None  # Set by enable_instrumentation()
+        self.record_history = True  # Record each saved list in the snapshot history
+        self.list_complete = {}  # list type -> whether the last harvest reached the end of the list
+        self.list_errors = {}  # list type -> why the last harvest failed, if it did
+        self.history_recorded = set()  # list types this run added to the snapshot history
+        self.request_limiter = None  # RateLimiter spacing this account's page loads and API requests
 
         # Create all directories
         os.makedirs(self.base_dir, exist_ok=True)
         os.makedirs(self.screenshots_dir, exist_ok=True)
         os.makedirs(self.json_dir, exist_ok=True)
+        os.makedirs(self.sessions_dir, exist_ok=True)
+        os.makedirs(self.checkpoints_dir, exist_ok=True)
+
+        # Session reuse between runs
+        self.use_session_cache = True
+        self.interactive = True  # Set False for cron-style runs: no input() prompts during login
+
+        # The browser is started the first time self.driver is used, so offline
+        # analysis never launches Chrome
+        self.profile_dir = profile_dir
+        self.lean = lean  # Block images, video and tracking, and don't wait for subresources
+        self._driver = None
+        self._wait = None
+
+        # Debug mode for saving screenshots
+        self.debug = True
+        self.screenshot_counter = 0
+        self.screenshot_prefix = datetime.now().strftime('%Y%m%d_%H%M%S')  # Keeps this run's files apart
+        self.screenshot_format = "png"  # png, jpeg or webp
+        self.screenshot_quality = 80  # Only used for jpeg and webp
+        self.screenshot_interval = 0.5  # Minimum seconds between screenshots
+        self.max_screenshots = 200  # Older screenshots are deleted beyond this
+        self.screenshot_writer = None
+        self.last_screenshot = 0
+
+    @property
+    def driver(self):
+        """The WebDriver, starting Chrome on first use"""
+        if self._driver is None:
+            self.start_browser()
+        return self._driver
+
+    @property
+    def wait(self):
+        if self._wait is None:
+            self.start_browser()
+        return self._wait
+
+    def start_browser(self):
+        """Launch Chrome with the tracker's options"""
+        load_selenium()
 
         # Configure Chrome options
         options = webdriver.ChromeOptions()
@@ -53,15 +922,36 @@ class UnfollowTracker:
         options.add_experimental_option("useAutomationExtension", False)
 
         # Headless mode option
-        if headless:
+        if self.headless:
             options.add_argument("--headless=new")
             options.add_argument("--window-size=1920,1080")
 
-        self.driver = webdriver.Chrome(options=options)
-        self.driver.maximize_window()
+        # A persistent profile keeps cookies and cache warm between runs
+        if self.profile_dir:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            options.add_argument(f"--user-data-dir={os.path.abspath(self.profile_dir)}")
+
+        # Performance logging exposes Network.* events for list capture
+        if self.capture_network:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+        # Lean mode: don't wait for subresources, and skip images, video and tracking entirely
+        if self.lean:
+            options.page_load_strategy = "eager"
+
+        driver = webdriver.Chrome(options=options)
+        self._driver = driver
+        driver.maximize_window()
+
+        if self.lean:
+            try:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+            except Exception as e:
+                print(f"Could not block media requests: {e}")
 
         # Execute CDP commands to prevent detection
-        self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
             "source": """
                 Object.defineProperty(navigator, 'webdriver', {
                     get: () => undefined
@@ -70,23 +960,59 @@ class UnfollowTracker:
         })
 
         # Create a wait object
-        self.wait = WebDriverWait(self.driver, 15)
+        self._wait = WebDriverWait(driver, 15)
 
-        # Debug mode for saving screenshots
-        self.debug = True
-        self.screenshot_counter = 0
+        if self.instrumentation:
+            self.instrumentation.attach_driver(driver)
+        return driver
+
+    def enable_instrumentation(self, instrumentation=None):
+        """Count and time WebDriver commands, sleeps and phases for a run report"""
+        self.instrumentation = instrumentation or Instrumentation()
+        self.instrumentation.attach(self)
+        return self.instrumentation
 
     def take_screenshot(self, name):
-        """Save screenshot for debugging if debug mode is enabled"""
+        """Save screenshot for debugging if debug mode is enabled.
+
+        The image is captured through CDP and written by a background thread, so
+        only the capture itself holds up the caller. Screenshots requested less
+        than screenshot_interval seconds after the previous one are skipped.
+        """
         if self.debug:
             try:
+                now = time.time()
+                if now - self.last_screenshot < self.screenshot_interval:
+                    return
+                self.last_screenshot = now
+
+                if self.screenshot_writer is None:
+                    self.screenshot_writer = ScreenshotWriter(self.screenshots_dir, self.max_screenshots)
+
+                params = {"format": self.screenshot_format}
+                if self.screenshot_format != "png":
+                    params["quality"] = self.screenshot_quality
+                try:
+                    data = self.driver.execute_cdp_cmd("Page.captureScreenshot", params)["data"]
+                    extension = self.screenshot_format
+                except Exception:
+                    # Not a Chromium driver - fall back to a plain WebDriver screenshot
+                    data = self.driver.get_screenshot_as_base64()
+                    extension = "png"
+
                 self.screenshot_counter += 1
-                filename = f"{self.screenshots_dir}/{self.screenshot_counter:03d}_{name}.png"
-                self.driver.save_screenshot(filename)
-                print(f"Screenshot saved: {filename}")
+                filename = (f"{self.screenshots_dir}/{self.screenshot_prefix}_"
+                            f"{self.screenshot_counter:03d}_{name}.{extension}")
+                self.screenshot_writer.submit(filename, data)
             except Exception as e:
                 print(f"Error taking screenshot: {e}")
 
+    def load_page(self, url):
+        """Navigate to url, spaced from this account's other requests when request pacing is on"""
+        if self.request_limiter:
+            self.request_limiter.wait()
+        self.driver.get(url)
+
     def random_sleep(self, min_time=1, max_time=3):
         """Sleep for a random time between min_time and max_time seconds"""
         time.sleep(random.uniform(min_time, max_time))
@@ -162,8 +1088,8 @@ class UnfollowTracker:
             print(f"All click methods failed: {e}")
             return False
 
-    def click_element_by_xpath(self, xpath):
-        """Try to click an element using given XPath"""
+    def click_element_by_xpath(self, xpath, fast=False):
+        """Try to click an element using given XPath. fast skips the pause after scrolling it into view"""
         elements = self.driver.find_elements(By.XPATH, xpath)
         if not elements:
             return False
@@ -174,7 +1100,8 @@ class UnfollowTracker:
                     # Try scrolling into view first
                     try:
                         self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", elem)
-                        self.random_sleep(0.5, 1)
+                        if not fast:
+                            self.random_sleep(0.5, 1)
                     except:
                         pass
 
@@ -187,8 +1114,8 @@ class UnfollowTracker:
 
         return False
 
-    def js_click_element_by_xpath(self, xpath):
-        """Try to click an element using JavaScript and given XPath"""
+    def js_click_element_by_xpath(self, xpath, fast=False):
+        """Try to click an element using JavaScript and given XPath. fast skips the pause after scrolling it into view"""
         elements = self.driver.find_elements(By.XPATH, xpath)
         if not elements:
             return False
@@ -198,7 +1125,8 @@ class UnfollowTracker:
                 # Try scrolling into view first
                 try:
                     self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", elem)
-                    self.random_sleep(0.5, 1)
+                    if not fast:
+                        self.random_sleep(0.5, 1)
                 except:
                     pass
 
@@ -211,10 +1139,58 @@ class UnfollowTracker:
 
         return False
 
+    def wait_for_xpath(self, xpath, timeout):
+        """Wait until an element matching xpath is present. Returns False on timeout"""
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                EC.presence_of_element_located((By.XPATH, xpath)))
+            return True
+        except Exception:
+            return False
+
+    def settle_page(self, page_type, min_time=3, max_time=5):
+        """Wait for the element that worked last time on this page type instead of a fixed sleep"""
+        winner = self.strategies.winner(page_type)
+        if winner and self.wait_for_xpath(winner, self.settle_timeout):
+            return
+        self.random_sleep(min_time, max_time)
+
+    def run_click_strategies(self, page_type, label, click_strategies, confirm_xpath=None, confirm_timeout=5):
+        """Try (click function, xpath) strategies, the one that worked last time first.
+
+        Once a winner is known the others are only a fallback, so they skip the
+        pause after scrolling into view. A click only counts as a win once
+        confirm_xpath (e.g. the dialog it should open) appears; strategies that
+        fail are demoted. Returns True if a click succeeded.
+        """
+        numbered = list(enumerate(click_strategies, 1))
+        ordered = self.strategies.order(page_type, numbered, key=lambda item: item[1][1])
+        fast = self.strategies.winner(page_type) is not None
+
+        for position, (i, (click, xpath)) in enumerate(ordered):
+            try:
+                print(f"Trying {label} button click strategy {i}...")
+                started = time.time()
+                if not click(xpath, fast=fast and position > 0):
+                    self.strategies.record_failure(page_type, xpath)
+                    continue
+                if confirm_xpath and not self.wait_for_xpath(confirm_xpath, confirm_timeout):
+                    print(f"Strategy {i} clicked something, but the {label} list didn't open")
+                    self.strategies.record_failure(page_type, xpath)
+                    continue
+                self.strategies.record(page_type, xpath, time.time() - started)
+                print(f"Successfully clicked {label} using strategy {i}")
+                self.take_screenshot(f"{label}_clicked_strategy_{i}")
+                return True
+            except Exception as e:
+                print(f"Strategy {i} failed: {e}")
+                self.strategies.record_failure(page_type, xpath)
+        return False
+
     def login(self):
         """Login to Instagram account"""
         print("Logging in to Instagram...")
-        self.driver.get(self.URL)
+        self.load_page(self.URL)
         self.random_sleep(3, 5)
         self.take_screenshot("initial_load")
 
@@ -240,13 +1216,13 @@ class UnfollowTracker:
             # Type like a human with random delays between characters
             for char in self.username:
                 username_field.send_keys(char)
-                time.sleep(random.uniform(0.05, 0.15))
+                self.random_sleep(0.05, 0.15)
 
             self.random_sleep(0.5, 1)
 
             for char in self.password:
                 password_field.send_keys(char)
-                time.sleep(random.uniform(0.05, 0.15))
+                self.random_sleep(0.05, 0.15)
 
             self.random_sleep(0.5, 1)
             self.take_screenshot("before_login_click")
@@ -256,7 +1232,11 @@ class UnfollowTracker:
 
             print("Waiting for verification process...")
             self.take_screenshot("waiting_for_verification")
-            input("Complete any verification manually if required, then press Enter to continue...")
+            if self.interactive:
+                input("Complete any verification manually if required, then press Enter to continue...")
+            else:
+                # Unattended runs can't answer prompts, so just give the redirect time to finish
+                self.random_sleep(5, 8)
 
             # Handle "Save Login Info" dialog if it appears
             try:
@@ -298,25 +1278,144 @@ class UnfollowTracker:
             self.take_screenshot("login_error")
             return False
 
+    def session_file(self):
+        """Path of the saved browser session for this account"""
+        return os.path.join(self.sessions_dir, f"{self.username}.json")
+
+    def save_session(self):
+        """Save the browser's cookies and local storage so the next run can skip login"""
+        try:
+            session = {
+                "saved_at": datetime.now().isoformat(),
+                "url": self.URL,
+                "cookies": self.driver.get_cookies(),
+                "local_storage": self.driver.execute_script(
+                    "var items = {}; "
+                    "for (var i = 0; i < localStorage.length; i++) { "
+                    "var key = localStorage.key(i); items[key] = localStorage.getItem(key); } "
+                    "return items;"
+                ),
+            }
+            # The file holds live session cookies, so keep it private
+            fd = os.open(self.session_file(), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(session, f)
+            print(f"Session saved to {self.session_file()}")
+        except Exception as e:
+            print(f"Could not save session: {e}")
+
+    def restore_session(self):
+        """Load a saved session into the browser. Returns False if there is nothing usable to load"""
+        if not os.path.exists(self.session_file()):
+            return False
+
+        try:
+            with open(self.session_file(), 'r') as f:
+                session = json.load(f)
+        except Exception as e:
+            print(f"Could not read saved session: {e}")
+            return False
+
+        if session.get("url") != self.URL or not session.get("cookies"):
+            return False
+
+        # Cookies and storage can only be set for the domain currently loaded
+        self.load_page(self.URL)
+        for cookie in session["cookies"]:
+            if cookie.get("sameSite") not in ("Strict", "Lax", "None"):
+                cookie.pop("sameSite", None)
+            try:
+                self.driver.add_cookie(cookie)
+            except Exception as e:
+                print(f"Could not restore cookie {cookie.get('name')}: {e}")
+
+        try:
+            self.driver.execute_script(
+                "var items = arguments[0]; "
+                "for (var key in items) { localStorage.setItem(key, items[key]); }",
+                session.get("local_storage") or {}
+            )
+        except Exception as e:
+            print(f"Could not restore local storage: {e}")
+
+        print(f"Restored session saved at {session.get('saved_at')}")
+        return True
+
+    def is_session_valid(self):
+        """Reload the restored page once so the cookies take effect, and check whether it is logged in"""
+        try:
+            if self.request_limiter:
+                self.request_limiter.wait()
+            self.driver.refresh()
+            # Either the login form or the logged-in page, whichever renders first
+            self.wait_for_xpath('//input[@name="password"] | //nav | //main', self.settle_timeout)
+
+            if not self.driver.get_cookie("sessionid"):
+                return False
+            if "/accounts/login" in self.driver.current_url:
+                return False
+            # A login form on the home page means the session was rejected
+            return not self.driver.find_elements(By.NAME, "password")
+        except Exception as e:
+            print(f"Could not check session: {e}")
+            return False
+
+    def ensure_logged_in(self):
+        """Reuse a saved session when it is still valid, otherwise log in and save the new session"""
+        if self.use_session_cache and self.restore_session():
+            if self.is_session_valid():
+                print("Saved session is still valid. Skipping login.")
+                self.take_screenshot("session_restored")
+                return True
+            print("Saved session has expired. Logging in again...")
+            self.driver.delete_all_cookies()
+
+        if not self.login():
+            return False
+
+        if self.use_session_cache:
+            self.save_session()
+        return True
+
     def get_count_from_text(self, text):
         """Extract numeric count from text like '123 followers' or '1,234 following'"""
-        if not text:
-            return 0
-
-        # Remove commas and extract digits
-        count_match = re.search(r'([\d,]+)', text)
-        if count_match:
-            count_text = count_match.group(1).replace(',', '')
-            # Handle 'K' (thousands)
-            if 'K' in text or 'k' in text:
-                return int(float(count_text) * 1000)
-            # Handle 'M' (millions)
-            elif 'M' in text or 'm' in text:
-                return int(float(count_text) * 1000000)
-            else:
-                return int(count_text)
+        return count_from_text(text)
+
+    def read_profile_count(self, selectors, keyword, max_plain):
+        """Find the follower/following count on the current profile page in a single script call"""
+        page_type = f"{keyword}_count"
+        selectors = self.strategies.order(page_type, selectors)
+        self.count_strategies.pop(keyword, None)
+        started = time.time()
+        texts = self.driver.execute_script(PROFILE_COUNT_TEXTS_JS, selectors, keyword, max_plain) or []
+        for index, text in texts:
+            count = self.get_count_from_text(text)
+            if count > 0:
+                print(f"Found count element with text: '{text}', extracted count: {count}")
+                self.count_precision[keyword] = count_precision(text)
+                if index >= 0:
+                    # Credited once a complete scrape agrees with the count (see confirm_profile_count)
+                    self.count_strategies[keyword] = (selectors[index], time.time() - started, count)
+                return count
         return 0
 
+    def confirm_profile_count(self, list_type, collected):
+        """Credit the selector behind a profile count when a complete scrape agrees with it, demote it otherwise"""
+        pending = self.count_strategies.pop(list_type, None)
+        if not pending:
+            return
+        selector, seconds, count = pending
+        page_type = f"{list_type}_count"
+        if count * 0.9 <= collected <= count * 1.1 + self.count_precision.get(list_type, 0):
+            self.strategies.record(page_type, selector, seconds)
+        else:
+            print(f"The profile count ({count}) doesn't match the {collected} {list_type} scraped.")
+            self.strategies.record_failure(page_type, selector)
+
+    def page_contains_text(self, text):
+        """Check whether text occurs anywhere in the rendered page, case-insensitively"""
+        return bool(self.driver.execute_script(PAGE_CONTAINS_TEXT_JS, text))
+
 
     def scrape_users_from_dialog(self, expected_count=None, list_type="following"):
         """
@@ -325,7 +1424,7 @@ class UnfollowTracker:
         """
         print(f"Extracting {list_type} list...")
         self.take_screenshot(f"{list_type}_dialog_start")
-        self.random_sleep(3, 5)
+        self.settle_page("scroll_box")
 
         # Better scroll container detection with multiple strategies
         scroll_box_xpaths = [
@@ -337,12 +1436,15 @@ class UnfollowTracker:
         ]
 
         scroll_box = None
-        for xpath in scroll_box_xpaths:
+        for xpath in self.strategies.order("scroll_box", scroll_box_xpaths):
             try:
+                started = time.time()
                 elements = self.driver.find_elements(By.XPATH, xpath)
                 for elem in elements:
                     if elem.is_displayed() and elem.size['height'] > 100:
                         scroll_box = elem
+                        scroll_box_xpath = xpath
+                        scroll_box_seconds = time.time() - started
                         print(f"Found scroll container using: {xpath}")
                         break
                 if scroll_box:
@@ -352,11 +1454,13 @@ class UnfollowTracker:
 
         if not scroll_box:
             print("⚠️ Could not find scroll container.")
+            self.list_errors[list_type] = "could not find the scroll container"
             self.take_screenshot(f"{list_type}_scroll_container_missing")
             return []
 
-        # Setup for scrolling
-        usernames = set()
+        # Setup for scrolling. The dialog lists the newest relationships first, so keep that order
+        usernames = []
+        seen = set()
         previous_count = -1
         stable_scrolls = 0
         max_stable_scrolls = self.stable_threshold
@@ -365,157 +1469,278 @@ class UnfollowTracker:
         min_expected_percent = 0.95
         force_continue_scrolling = True
         prev_height = -1
+        stable_heights = 0  # Scrolls in a row that didn't change the scroll height
+        completed = False  # Set when the end of the list (or the expected count) was actually reached
+        scroll_box_confirmed = False  # Set once scrolling the container has loaded more rows
+        collected_any = False
+
+        # Forget links harvested from a previous dialog
+        if self.harvest_mode in ("js", "observer", "network"):
+            try:
+                self.driver.execute_script("window.__iutSeenHrefs = {};")
+            except Exception as e:
+                print(f"Could not reset in-page harvester: {e}")
+
+        # Pruning relies on the in-page record of harvested links, which webdriver mode doesn't keep
+        pruning = self.prune_rows
+        if pruning and self.harvest_mode == "webdriver":
+            print("Row pruning needs --harvest-mode js, observer or network. Keeping all rows.")
+            pruning = False
+        pruned = 0
+
+        # Adaptive pacing replaces the fixed delay with one tuned to how fast rows load
+        pacer = None
+        if self.adaptive_pacing:
+            pacer = ScrollPacer(self.scroll_delay, self.min_scroll_delay, self.max_scroll_delay)
+            try:
+                self.driver.set_script_timeout(self.max_scroll_delay + 10)
+            except Exception as e:
+                print(f"Could not prepare adaptive pacing, using the fixed delay: {e}")
+                pacer = None
+
+        # In observer mode the page queues rows as they are inserted
+        observing = self.harvest_mode == "observer" and self.install_dialog_observer(scroll_box)
+
+        # In network mode the user records come from the API responses, not the DOM
+        capturing = self.harvest_mode == "network" and self.capture_network
+        if self.harvest_mode == "network" and not self.capture_network:
+            print("Network capture was not enabled when the browser started. Reading the dialog instead.")
+
+        # In incremental mode, scroll only until the rows reach accounts from the previous snapshot
+        previous = self.load_previous_list(list_type) if self.incremental else None
+        known = set(previous) if previous else None
+        known_run = 0
+
+        # Pick up where an interrupted run left off
+        checkpoint = self.load_checkpoint(list_type) if self.resume else None
+        if checkpoint:
+            usernames.extend(user for user in checkpoint["usernames"] if user not in seen)
+            seen.update(usernames)
+            scroll_count = checkpoint.get("scroll_count", 0)
+            previous_count = len(usernames)
+            print(f"Resuming {list_type} from checkpoint: {len(usernames)} usernames, scroll {scroll_count}")
+            prev_height = self.fast_forward_dialog(scroll_box, checkpoint.get("last_height", 0))
+        last_checkpoint_scroll = scroll_count
+
+        # Stream usernames to disk as they arrive when an NDJSON output format is selected
+        list_writer = self.open_list_writer(list_type)
+        if list_writer:
+            list_writer.write(usernames)
 
         print(f"Target extraction: approximately {expected_count} usernames")
         print("Scrolling and collecting usernames...")
 
         # Main scrolling loop
-        while scroll_count < max_scrolls:
-            # More aggressive scrolling - try different techniques in sequence
-            try:
-                # Method 1: Standard scroll
-                self.driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", scroll_box)
-
-                # Method 2: Force scroll with JavaScript
-                if scroll_count % 3 == 0:
-                    current_height = self.driver.execute_script("return arguments[0].scrollHeight", scroll_box)
-                    self.driver.execute_script(f"arguments[0].scrollTop = {current_height + 1000}", scroll_box)
-
-                # Method 3: Use keyboard for scrolling occasionally
-                if scroll_count % 5 == 0:
-                    try:
-                        scroll_box.click()
-                        for i in range(10):
-                            webdriver.ActionChains(self.driver).send_keys(Keys.PAGE_DOWN).perform()
-                            self.random_sleep(0.2, 0.4)
-                    except:
-                        pass
-            except Exception as e:
-                print(f"Scrolling error: {e}")
-
-            # Longer sleep time to ensure content loads
-            self.random_sleep(self.scroll_delay, self.scroll_delay * 1.5)
+        try:
+            while scroll_count < max_scrolls:
+                # Remember the dialog content before this scroll, so rows that land early still count
+                row_signature = self.read_row_signature(scroll_box) if pacer and not observing else None
 
-            # Extract usernames
-            new_usernames = set()
+                # More aggressive scrolling - try different techniques in sequence
+                try:
+                    # Method 1: Standard scroll
+                    self.driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", scroll_box)
 
-            # Try different selection strategies for better extraction
-            try:
-                # Strategy 1: Find all links
-                elements = scroll_box.find_elements(By.XPATH, './/a[contains(@href, "/")]')
+                    # Method 2: Force scroll with JavaScript
+                    if scroll_count % 3 == 0:
+                        current_height = self.driver.execute_script("return arguments[0].scrollHeight", scroll_box)
+                        self.driver.execute_script(f"arguments[0].scrollTop = {current_height + 1000}", scroll_box)
 
-                # Strategy 2: If few elements found, try a broader selector
-                if len(elements) < 5:
-                    elements = scroll_box.find_elements(By.XPATH,
-                                                        './/*[contains(@href, "/") or contains(@role, "link")]')
+                    # Method 3: Use keyboard for scrolling occasionally (adaptive pacing only when stuck)
+                    if scroll_count % 5 == 0 and (pacer is None or stable_scrolls > 0):
+                        try:
+                            scroll_box.click()
+                            for i in range(10):
+                                webdriver.ActionChains(self.driver).send_keys(Keys.PAGE_DOWN).perform()
+                                self.random_sleep(0.2, 0.4)
+                        except:
+                            pass
+                except Exception as e:
+                    print(f"Scrolling error: {e}")
 
-                # Process all found elements
-                for elem in elements:
-                    try:
-                        href = elem.get_attribute('href')
-                        username = self.extract_username_from_href(href)
-                        if self.is_valid_username(username):
-                            new_usernames.add(username.strip())
-                    except:
-                        continue
+                scroll_count += 1
 
-                # Strategy 3: As last resort, try to find usernames in text content
-                if len(new_usernames) < 3 and scroll_count > 3:
+                if observing:
+                    # Wait only until the next page of rows lands, up to the usual delay
+                    started = time.time()
+                    new_usernames = self.drain_observed_usernames(pacer.delay if pacer else self.scroll_delay * 1.5)
+                    if pacer:
+                        pacer.record(time.time() - started if new_usernames else None)
+                    if not new_usernames and not usernames and scroll_count > 3:
+                        new_usernames = self.harvest_usernames_webdriver(scroll_box, scroll_count)
+                else:
+                    if pacer:
+                        # Wait until new rows show up, for at most the current adaptive delay
+                        pacer.record(self.wait_for_new_rows(scroll_box, pacer.delay, row_signature))
+                    else:
+                        # Longer sleep time to ensure content loads
+                        self.random_sleep(self.scroll_delay, self.scroll_delay * 1.5)
+
+                    if capturing:
+                        new_usernames = self.harvest_network_usernames(list_type)
+                        if not new_usernames and not usernames and scroll_count > 3:
+                            print("No user list responses captured. Reading the dialog instead.")
+                            capturing = False
+
+                    if not capturing:
+                        # Extract usernames
+                        new_usernames = self.harvest_usernames(scroll_box, scroll_count, len(usernames))
+
+                # Update the collected usernames, keeping the dialog order
+                prev_total = len(usernames)
+                fresh = [user for user in dict.fromkeys(new_usernames) if user not in seen]
+                seen.update(fresh)
+                usernames.extend(fresh)
+                if list_writer:
+                    list_writer.write(fresh)
+                current_total = len(usernames)
+                new_count = current_total - prev_total
+                collected_any = collected_any or new_count > 0
+
+                # The container is only a win once scrolling it loaded rows beyond the first batch
+                if new_count > 0 and prev_total > 0 and not scroll_box_confirmed:
+                    self.strategies.record("scroll_box", scroll_box_xpath, scroll_box_seconds)
+                    scroll_box_confirmed = True
+
+                # Count how many already-known accounts have been read in a row
+                if known is not None:
+                    for user in fresh:
+                        known_run = known_run + 1 if user in known else 0
+
+                # Drop rows that have been read so the DOM stops growing
+                if pruning:
                     try:
-                        elements = scroll_box.find_elements(By.XPATH, './/*[not(self::script)]')
-                        for elem in elements:
+                        pruned += self.driver.execute_script(PRUNE_HARVESTED_ROWS_JS, scroll_box,
+                                                             self.prune_keep, capturing) or 0
+                    except Exception as e:
+                        print(f"Row pruning failed, keeping all rows from now on: {e}")
+                        pruning = False
+
+                # Periodically persist progress
+                if scroll_count - last_checkpoint_scroll >= self.checkpoint_interval:
+                    self.save_checkpoint(list_type, usernames, scroll_count, prev_height, expected_count)
+                    last_checkpoint_scroll = scroll_count
+
+                # Log progress more frequently
+                if scroll_count % 5 == 0 or new_count > 0:
+                    print(f"[{list_type}] Scroll {scroll_count}: {current_total} usernames collected (+{new_count} new)")
+
+                    # Take strategic screenshots
+                    if scroll_count % 20 == 0 or (new_count > 0 and scroll_count % 10 == 0):
+                        self.take_screenshot(f"{list_type}_scroll_{scroll_count}")
+
+                # Check if we're making progress on usernames
+                if current_total == previous_count:
+                    stable_scrolls += 1
+                    if stable_scrolls % 5 == 0:
+                        print(f"No new usernames after {stable_scrolls} scrolls. Continuing...")
+
+                        # Try alternative scrolling techniques when stuck
+                        if stable_scrolls % 10 == 0:
                             try:
-                                text = elem.text
-                                if text and '@' in text:
-                                    potential_username = text.strip().replace('@', '')
-                                    if self.is_valid_username(potential_username):
-                                        new_usernames.add(potential_username)
-                            except:
-                                continue
-                    except:
-                        pass
-            except Exception as e:
-                print(f"Error extracting usernames: {e}")
-
-            # Update the set of collected usernames
-            prev_total = len(usernames)
-            usernames.update(new_usernames)
-            current_total = len(usernames)
-            new_count = current_total - prev_total
-
-            # Log progress more frequently
-            if scroll_count % 5 == 0 or new_count > 0:
-                print(f"[{list_type}] Scroll {scroll_count}: {current_total} usernames collected (+{new_count} new)")
-
-                # Take strategic screenshots
-                if scroll_count % 20 == 0 or (new_count > 0 and scroll_count % 10 == 0):
-                    self.take_screenshot(f"{list_type}_scroll_{scroll_count}")
-
-            # Check if we're making progress on usernames
-            if current_total == previous_count:
-                stable_scrolls += 1
-                if stable_scrolls % 5 == 0:
-                    print(f"No new usernames after {stable_scrolls} scrolls. Continuing...")
-
-                    # Try alternative scrolling techniques when stuck
-                    if stable_scrolls % 10 == 0:
-                        try:
-                            print("Trying alternative scrolling techniques...")
-
-                            # Try refreshing the scroll container
-                            self.driver.execute_script("arguments[0].scrollTop = 0", scroll_box)
-                            self.random_sleep(1, 2)
+                                print("Trying alternative scrolling techniques...")
 
-                            # Try scrolling from a different point
-                            halfway = self.driver.execute_script("return arguments[0].scrollHeight", scroll_box) / 2
-                            self.driver.execute_script(f"arguments[0].scrollTop = {halfway}", scroll_box)
-                            self.random_sleep(1, 2)
+                                # Try refreshing the scroll container
+                                self.driver.execute_script("arguments[0].scrollTop = 0", scroll_box)
+                                self.random_sleep(1, 2)
 
-                            # Try clicking inside and pressing End key
-                            try:
-                                webdriver.ActionChains(self.driver).move_to_element(scroll_box).click().perform()
-                                webdriver.ActionChains(self.driver).send_keys(Keys.END).perform()
+                                # Try scrolling from a different point
+                                halfway = self.driver.execute_script("return arguments[0].scrollHeight", scroll_box) / 2
+                                self.driver.execute_script(f"arguments[0].scrollTop = {halfway}", scroll_box)
                                 self.random_sleep(1, 2)
-                            except:
-                                pass
-                        except Exception as e:
-                            print(f"Alternative scrolling failed: {e}")
-            else:
-                stable_scrolls = 0
-                previous_count = current_total
-
-            # Check if scrolling is making any difference to the scroll height
-            current_height = self.driver.execute_script("return arguments[0].scrollHeight", scroll_box)
-            if current_height == prev_height and scroll_count > 10:
-                print("Scroll height not changing. May have reached end of list.")
-                stable_scrolls += 1
-            prev_height = current_height
-
-            # Determine if we should stop scrolling
-            if stable_scrolls >= max_stable_scrolls and not force_continue_scrolling:
-                print(f"No new usernames after {stable_scrolls} scrolls. Stopping.")
-                break
 
-            # If we have an expected count, check if we're close enough
-            if expected_count and current_total >= expected_count * min_expected_percent:
-                print(
-                    f"Collected {current_total} usernames ({(current_total / expected_count) * 100:.1f}% of expected).")
+                                # Try clicking inside and pressing End key
+                                try:
+                                    webdriver.ActionChains(self.driver).move_to_element(scroll_box).click().perform()
+                                    webdriver.ActionChains(self.driver).send_keys(Keys.END).perform()
+                                    self.random_sleep(1, 2)
+                                except:
+                                    pass
+                            except Exception as e:
+                                print(f"Alternative scrolling failed: {e}")
+                else:
+                    stable_scrolls = 0
+                    previous_count = current_total
+
+                # Check if scrolling is making any difference to the scroll height
+                current_height = self.driver.execute_script("return arguments[0].scrollHeight", scroll_box)
+                if current_height == prev_height and scroll_count > 10:
+                    print("Scroll height not changing. May have reached end of list.")
+                    stable_scrolls += 1
+                    stable_heights += 1
+                else:
+                    stable_heights = 0
+                prev_height = current_height
+
+                # Without a profile count to aim for, a list that stopped growing has ended
+                if not expected_count and stable_heights >= max_stable_scrolls:
+                    force_continue_scrolling = False
 
-                # If we've really reached the target, we can stop
-                if current_total >= expected_count * 0.98:
+                # Determine if we should stop scrolling
+                if stable_scrolls >= max_stable_scrolls and not force_continue_scrolling:
+                    print(f"No new usernames after {stable_scrolls} scrolls. Stopping.")
+                    completed = True
                     break
 
-                # If we're close, we disable force_continue_scrolling and rely on stable_scrolls
-                if stable_scrolls >= 5:
-                    force_continue_scrolling = False
+                # If we have an expected count, check if we're close enough
+                if expected_count and current_total >= expected_count * min_expected_percent:
+                    print(
+                        f"Collected {current_total} usernames ({(current_total / expected_count) * 100:.1f}% of expected).")
 
-            # Emergency brake - too many scrolls with minimal progress
-            if stable_scrolls > 25:
-                print(f"Emergency stop: {stable_scrolls} stable scrolls with minimal progress.")
-                break
+                    # If we've really reached the target, we can stop. Incremental scans need the
+                    # whole list, since the next run merges in everything below the new rows.
+                    if current_total >= expected_count * 0.98 and not self.incremental:
+                        completed = True
+                        break
+
+                    # If we're close, we disable force_continue_scrolling and rely on stable_scrolls
+                    if stable_scrolls >= 5:
+                        force_continue_scrolling = False
+
+                # Past the new rows: the rest of the list should match the previous snapshot
+                if known is not None and known_run >= self.incremental_overlap:
+                    merged = self.merge_with_previous(usernames, previous, expected_count,
+                                                      self.count_precision.get(list_type, 0))
+                    if merged is not None:
+                        usernames = merged
+                        completed = True
+                        break
+                    print("Continuing with a full scrape.")
+                    known = None
+
+                # Emergency brake - too many scrolls with minimal progress
+                if stable_scrolls > 25:
+                    print(f"Emergency stop: {stable_scrolls} stable scrolls with minimal progress.")
+                    break
+        except BaseException:
+            # Keep what we have so a crash, rate limit or Ctrl-C can be resumed with --resume
+            self.save_checkpoint(list_type, usernames, scroll_count, prev_height, expected_count)
+            raise
+
+        if observing:
+            try:
+                self.driver.execute_script(STOP_OBSERVER_JS)
+            except:
+                pass
 
         self.take_screenshot(f"{list_type}_scrolling_complete")
         print(f"Finished: {len(usernames)} unique usernames extracted from {list_type} list.")
+        if pruned:
+            print(f"Pruned {pruned} harvested rows from the dialog.")
+        if pacer:
+            print(f"Adaptive pacing: final delay {pacer.delay:.2f}s, "
+                  f"average row latency {pacer.average_latency():.2f}s")
+        self.list_complete[list_type] = completed
+        if not collected_any:
+            # Probably an element that doesn't scroll; try the others first next time
+            self.strategies.record_failure("scroll_box", scroll_box_xpath)
+        if completed:
+            self.confirm_profile_count(list_type, len(usernames))
+            self.clear_checkpoint(list_type)
+        else:
+            # Stopped early (emergency brake or scroll limit): keep the partial list for --resume
+            self.save_checkpoint(list_type, usernames, scroll_count, prev_height, expected_count)
+        self.row_latency = pacer.average_latency() if pacer else None
 
         # Check success rate
         if expected_count:
@@ -528,6 +1753,8 @@ class UnfollowTracker:
                 print("Instagram may be limiting the data we can extract.")
 
                 # Try one more time with a new approach if we have a poor extraction rate
+                if success_rate < 50:
+                    self.list_complete[list_type] = False
                 if success_rate < 50 and list_type == "following":
                     print("Trying alternative extraction method...")
                     return self.get_following_alternative()
@@ -540,67 +1767,312 @@ class UnfollowTracker:
         except:
             pass
 
-        return list(usernames)
+        return usernames
 
-    def extract_username_from_href(self, href):
-        """Extract username from Instagram profile URL with improved parsing"""
-        if not href:
-            return ""
+    def load_previous_list(self, list_type):
+        """Usernames from the newest saved export of a list, in dialog order, or None"""
+        path = latest_list_file(self.json_dir, self.username, list_type)
+        if not path:
+            print(f"No previous {list_type} snapshot found. Running a full scrape.")
+            return None
+        try:
+            previous = list(dict.fromkeys(iter_usernames(path)))
+        except Exception as e:
+            print(f"Could not read previous snapshot {path}: {e}. Running a full scrape.")
+            return None
+        print(f"Incremental scrape against {path} ({len(previous)} usernames)")
+        return previous
+
+    def merge_with_previous(self, head, previous, expected_count, precision=0):
+        """Combine freshly scraped rows with the unscrolled tail of the previous snapshot.
+
+        New relationships only ever appear at the top of the dialog. Previous
+        accounts above the deepest one seen again are gone; below it, the
+        merged list can only be too long if accounts dropped out of the tail.
+        Returns None when the result doesn't match the profile count, give or
+        take its rounding precision (or incremental_tolerance, if larger).
+        """
+        head_set = set(head)
+        positions = {user: i for i, user in enumerate(previous)}
+        reached = max((positions[user] for user in head if user in positions), default=-1)
+        merged = head + [user for user in previous[reached + 1:] if user not in head_set]
+        if not expected_count:
+            print("No profile count to check the incremental result against.")
+            return None
+        difference = len(merged) - expected_count
+        if abs(difference) > max(self.incremental_tolerance, precision):
+            print(f"Incremental result has {len(merged)} usernames but the profile shows {expected_count} "
+                  f"({difference:+d}).")
+            return None
+        print(f"Reached the previous snapshot after {len(head)} rows. "
+              f"Kept {len(merged) - len(head)} usernames from its tail ({len(merged)} total).")
+        return merged
+
+    def checkpoint_file(self, list_type):
+        """Path of the in-progress checkpoint for a list"""
+        return os.path.join(self.checkpoints_dir, f"{self.username}_{list_type}.json")
+
+    def save_checkpoint(self, list_type, usernames, scroll_count, last_height, expected_count=None):
+        """Write the partial username set and scroll position so the scrape can be resumed"""
+        checkpoint = {
+            "list_type": list_type,
+            "usernames": list(usernames),  # In dialog order
+            "scroll_count": scroll_count,
+            "last_height": last_height,
+            "expected_count": expected_count,
+            "updated_at": datetime.now().isoformat(),
+        }
+        try:
+            # Write to a temp file first so an interrupted write can't corrupt the checkpoint
+            temp_file = self.checkpoint_file(list_type) + ".tmp"
+            with open(temp_file, 'w') as f:
+                json.dump(checkpoint, f)
+            os.replace(temp_file, self.checkpoint_file(list_type))
+            print(f"Checkpoint saved: {len(usernames)} {list_type} usernames at scroll {scroll_count}")
+        except Exception as e:
+            print(f"Error saving checkpoint: {e}")
 
-        # Clean and parse URL
+    def load_checkpoint(self, list_type):
+        """Load a saved checkpoint for a list, or None if there isn't one"""
+        if not os.path.exists(self.checkpoint_file(list_type)):
+            return None
         try:
-            # Remove trailing slash and query parameters
-            href = href.split('?')[0].rstrip('/')
-
-            # Extract username part - avoid common non-username paths
-            invalid_paths = ['/p/', '/explore/', '/reels/', '/stories/', '/direct/', '/tags/']
-
-            # Skip processing if the URL contains invalid paths
-            if any(invalid_path in href for invalid_path in invalid_paths):
-                return ""
-
-            # Extract the username (should be the last part of the URL for profile pages)
-            parts = href.split('/')
-            # Get the last non-empty part
-            username_parts = [part for part in parts if part]
-            if username_parts:
-                return username_parts[-1]
+            with open(self.checkpoint_file(list_type), 'r') as f:
+                return json.load(f)
         except Exception as e:
-            print(f"Error extracting username from URL {href}: {e}")
+            print(f"Error loading checkpoint: {e}")
+            return None
 
-        return ""
+    def clear_checkpoint(self, list_type):
+        """Remove the checkpoint once a list has been scraped to the end"""
+        try:
+            os.remove(self.checkpoint_file(list_type))
+        except OSError:
+            pass
 
-    def is_valid_username(self, username):
-        """Check if a username appears valid with improved validation"""
-        if not username:
+    def fast_forward_dialog(self, scroll_box, target_height, max_attempts=500):
+        """Scroll quickly back down to a previous position without the usual per-scroll delays"""
+        height = self.driver.execute_script("return arguments[0].scrollHeight", scroll_box)
+        stalled = 0
+        attempts = 0
+        while height < target_height and stalled < 10 and attempts < max_attempts:
+            self.driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", scroll_box)
+            self.random_sleep(0.3, 0.6)
+            new_height = self.driver.execute_script("return arguments[0].scrollHeight", scroll_box)
+            stalled = stalled + 1 if new_height == height else 0
+            height = new_height
+            attempts += 1
+
+        print(f"Fast-forwarded dialog to height {height} (checkpoint was at {target_height})")
+        return height
+
+    def read_row_signature(self, scroll_box):
+        """Summary of the dialog content to compare against after scrolling, or None if unavailable"""
+        try:
+            return self.driver.execute_script(ROW_SIGNATURE_JS, scroll_box)
+        except Exception as e:
+            print(f"Could not read the dialog state: {e}")
+            return None
+
+    def wait_for_new_rows(self, scroll_box, timeout, before=None):
+        """Block until the dialog content differs from the signature taken before the scroll.
+
+        Returns the seconds it took, or None on timeout.
+        """
+        try:
+            elapsed_ms = self.driver.execute_async_script(WAIT_FOR_ROWS_JS, scroll_box, int(timeout * 1000), before)
+        except Exception as e:
+            print(f"Could not wait for new rows: {e}")
+            self.random_sleep(timeout, timeout)
+            return None
+        return None if elapsed_ms is None or elapsed_ms < 0 else elapsed_ms / 1000.0
+
+    def install_dialog_observer(self, scroll_box):
+        """Start queueing profile links into a page-level buffer as rows are inserted"""
+        try:
+            queued = self.driver.execute_script(INSTALL_OBSERVER_JS, scroll_box)
+            # Draining blocks in the browser, so allow it more than one scroll delay
+            self.driver.set_script_timeout(max(self.scroll_delay * 1.5, self.max_scroll_delay) + 10)
+            print(f"Watching dialog for new rows ({queued} already queued)")
+            return True
+        except Exception as e:
+            print(f"Could not install dialog observer, polling instead: {e}")
             return False
 
-        # Invalid usernames to filter out
-        invalid_keywords = ['explore', 'p', 'reels', 'stories', 'direct', 'tags',
-                            'about', 'accounts', 'legal', 'directory', 'hashtag',
-                            'login', 'signup', 'download', 'help', 'privacy', 'terms',
-                            'api', 'press', 'jobs', 'locations']
-
-        # Check if username looks valid
-        return (
-                username and
-                username.strip() != "" and
-                username.lower() not in invalid_keywords and
-                not username.startswith('p/') and
-                not username.startswith('@') and
-                '?' not in username and
-                '#' not in username and
-                '/' not in username and
-                ' ' not in username and
-                len(username) > 1 and  # Usernames are at least 2 characters
-                len(username) <= 30  # Instagram username length limit
-        )
+    def drain_observed_usernames(self, timeout):
+        """Block until the observer has queued new rows (or timeout seconds pass) and return them"""
+        try:
+            hrefs = self.driver.execute_async_script(DRAIN_OBSERVED_LINKS_JS, int(timeout * 1000))
+        except Exception as e:
+            print(f"Could not drain observed rows: {e}")
+            return []
+        return self.usernames_from_hrefs(hrefs)
+
+    def flush_network_log(self):
+        """Discard buffered performance log entries so capture starts with the next request"""
+        self.pending_responses = {}
+        if not self.capture_network:
+            return
+        try:
+            self.driver.get_log("performance")
+        except Exception as e:
+            print(f"Could not flush performance log: {e}")
+
+    def is_user_list_url(self, url, list_type=None):
+        """Check if a response URL is one of the pagination endpoints (for list_type, if given)"""
+        for pattern in USER_LIST_URL_PATTERNS:
+            match = re.search(pattern, url)
+            if match and (not list_type or match.group(1) in ("", list_type)):
+                return True
+        return False
+
+    def harvest_network_usernames(self, list_type="following"):
+        """Read user records from list responses the dialog has received since the last call"""
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception as e:
+            print(f"Could not read performance log: {e}")
+            return []
+
+        # Bodies can only be fetched once the response has finished loading
+        finished = []
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.responseReceived":
+                url = params.get("response", {}).get("url", "")
+                if self.is_user_list_url(url, list_type):
+                    self.pending_responses[params.get("requestId")] = url
+            elif method == "Network.loadingFinished" and params.get("requestId") in self.pending_responses:
+                finished.append(params["requestId"])
+
+        usernames = []
+        for request_id in finished:
+            url = self.pending_responses.pop(request_id)
+            try:
+                response = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            except Exception as e:
+                print(f"Could not read response body for {url}: {e}")
+                continue
+
+            body = response.get("body", "")
+            if response.get("base64Encoded"):
+                body = base64.b64decode(body).decode("utf-8", "replace")
+            self.record_network_fixture(list_type, url, body)
+
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                continue
+
+            for username, user_id in parse_user_records(payload, list_type):
+                if self.is_valid_username(username):
+                    usernames.append(username)
+                    if user_id:
+                        self.user_ids[username] = str(user_id)
+
+        return usernames
+
+    def record_network_fixture(self, list_type, url, body):
+        """Save a captured list response so it can be replayed later"""
+        if not self.capture_dir:
+            return
+        try:
+            os.makedirs(self.capture_dir, exist_ok=True)
+            self.capture_counter += 1
+            filename = os.path.join(self.capture_dir, f"{list_type}_{self.capture_counter:04d}.json")
+            with open(filename, 'w') as f:
+                json.dump({"url": url, "body": body}, f)
+        except Exception as e:
+            print(f"Error recording response fixture: {e}")
+
+    def harvest_usernames(self, scroll_box, scroll_count=0, collected_total=0):
+        """Collect the usernames currently visible in the dialog, in page order"""
+        if self.harvest_mode in ("js", "observer", "network"):
+            try:
+                # One round trip: the page returns only hrefs it hasn't handed out before
+                hrefs = self.driver.execute_script(HARVEST_LINKS_JS, scroll_box)
+                batch = self.usernames_from_hrefs(hrefs)
+
+                # An empty batch is normal once the list is loaded, but if nothing
+                # has ever been found the page layout is probably unexpected
+                if batch or collected_total > 0 or scroll_count <= 3:
+                    return batch
+            except Exception as e:
+                print(f"In-page harvest failed, falling back to element scan: {e}")
+
+        return self.harvest_usernames_webdriver(scroll_box, scroll_count)
+
+    def usernames_from_hrefs(self, hrefs):
+        """Turn a batch of profile hrefs into valid, de-duplicated usernames"""
+        return usernames_from_hrefs(hrefs)
+
+    def harvest_usernames_webdriver(self, scroll_box, scroll_count=0):
+        """Collect usernames by reading each element through WebDriver (slow but layout-tolerant)"""
+        new_usernames = []
+        seen = set()
+
+        # Try different selection strategies for better extraction
+        try:
+            # Strategy 1: Find all links
+            elements = scroll_box.find_elements(By.XPATH, './/a[contains(@href, "/")]')
+
+            # Strategy 2: If few elements found, try a broader selector
+            if len(elements) < 5:
+                elements = scroll_box.find_elements(By.XPATH,
+                                                    './/*[contains(@href, "/") or contains(@role, "link")]')
+
+            # Process all found elements
+            for elem in elements:
+                try:
+                    href = elem.get_attribute('href')
+                    username = self.extract_username_from_href(href)
+                    if self.is_valid_username(username) and username.strip() not in seen:
+                        seen.add(username.strip())
+                        new_usernames.append(username.strip())
+                except:
+                    continue
+
+            # Strategy 3: As last resort, try to find usernames in text content
+            if len(new_usernames) < 3 and scroll_count > 3:
+                try:
+                    elements = scroll_box.find_elements(By.XPATH, './/*[not(self::script)]')
+                    for elem in elements:
+                        try:
+                            text = elem.text
+                            if text and '@' in text:
+                                potential_username = text.strip().replace('@', '')
+                                if self.is_valid_username(potential_username) and potential_username not in seen:
+                                    seen.add(potential_username)
+                                    new_usernames.append(potential_username)
+                        except:
+                            continue
+                except:
+                    pass
+        except Exception as e:
+            print(f"Error extracting usernames: {e}")
+
+        return new_usernames
+
+    def extract_username_from_href(self, href):
+        """Extract username from Instagram profile URL with improved parsing"""
+        return username_from_href(href)
+
+    def is_valid_username(self, username):
+        """Check if a username appears valid with improved validation"""
+        return is_valid_username(username)
 
     def get_following(self):
         """Get the list of accounts the user is following with improved extraction"""
         print(f"Navigating to {self.username}'s profile to get following list...")
-        self.driver.get(f"{self.URL}{self.username}/")
-        self.random_sleep(3, 5)
+        self.list_errors.pop("following", None)
+        self.load_page(f"{self.URL}{self.username}/")
+        self.settle_page("following_button")
         self.take_screenshot("profile_page")
 
         # Get the count first with improved and aggressive counting
@@ -619,33 +2091,7 @@ class UnfollowTracker:
                 '//*[contains(text(), " following") or contains(text(), " Following")]'
             ]
 
-            for selector in count_selectors:
-                elements = self.driver.find_elements(By.XPATH, selector)
-                for elem in elements:
-                    text = elem.text or elem.get_attribute('innerText')
-                    if text and ('following' in text.lower() or
-                                 (text.isdigit() and int(text) > 0 and int(text) < 100000)):
-                        count = self.get_count_from_text(text)
-                        if count > 0:
-                            following_count = count
-                            print(f"Found count element with text: '{text}', extracted count: {count}")
-                            break
-                if following_count > 0:
-                    break
-
-            # Last resort - manual scan of all elements with numbers
-            if following_count == 0:
-                all_elements = self.driver.find_elements(By.XPATH, '//*')
-                for elem in all_elements:
-                    try:
-                        text = elem.text
-                        if text and 'following' in text.lower():
-                            count = self.get_count_from_text(text)
-                            if count > 0:
-                                following_count = count
-                                break
-                    except:
-                        continue
+            following_count = self.read_profile_count(count_selectors, "following", 100000)
 
             print(f"Found approximately {following_count} accounts you're following")
 
@@ -655,55 +2101,46 @@ class UnfollowTracker:
         # Take a screenshot of profile with counts visible
         self.take_screenshot("profile_with_counts")
 
-        # Click on the following button - try multiple approaches with improved selectors
-        following_button_clicked = False
+        # Only responses triggered by opening the dialog are of interest
+        self.flush_network_log()
 
+        # Click on the following button - try multiple approaches with improved selectors
         # Find and click using multiple strategies
         click_strategies = [
             # Strategy 1: Direct click on "following" text or link
-            lambda: self.click_element_by_xpath(
-                '//a[contains(@href, "/following")] | //div[contains(text(), " following")]'),
+            (self.click_element_by_xpath,
+             '//a[contains(@href, "/following")] | //div[contains(text(), " following")]'),
 
             # Strategy 2: Using JavaScript click with href selector
-            lambda: self.js_click_element_by_xpath('//a[contains(@href, "/following")]'),
+            (self.js_click_element_by_xpath, '//a[contains(@href, "/following")]'),
 
             # Strategy 3: Using the 2025 Instagram UI structure
-            lambda: self.click_element_by_xpath(
-                '//div[contains(@class, "x78zum5")]/../../div[2]//div | //div[contains(@class, "x9f619")]//div[contains(text(), "following")]'),
+            (self.click_element_by_xpath,
+             '//div[contains(@class, "x78zum5")]/../../div[2]//div | //div[contains(@class, "x9f619")]//div[contains(text(), "following")]'),
 
             # Strategy 4: Click on the count numbers
-            lambda: self.click_element_by_xpath('//section//ul//li[contains(., "following")]'),
+            (self.click_element_by_xpath, '//section//ul//li[contains(., "following")]'),
 
             # Strategy 5: Try a very broad selector as last resort
-            lambda: self.click_element_by_xpath('//*[contains(text(), "following")]')
+            (self.click_element_by_xpath, '//*[contains(text(), "following")]')
         ]
 
-        for i, click_strategy in enumerate(click_strategies):
-            try:
-                print(f"Trying following button click strategy {i + 1}...")
-                if click_strategy():
-                    following_button_clicked = True
-                    print(f"Successfully clicked following using strategy {i + 1}")
-                    self.take_screenshot(f"following_clicked_strategy_{i + 1}")
-                    break
-            except Exception as e:
-                print(f"Strategy {i + 1} failed: {e}")
+        following_button_clicked = self.run_click_strategies("following_button", "following", click_strategies,
+                                                             confirm_xpath='//div[@role="dialog"]')
 
         if not following_button_clicked:
             print("⚠️ Could not open following list! Taking screenshot and continuing...")
+            self.list_errors["following"] = "could not open the following list"
             self.take_screenshot("following_click_failed")
             return []
 
-        self.random_sleep(3, 5)
+        self.settle_page("scroll_box")
 
         # Extract usernames from the dialog
         self.following_list = self.scrape_users_from_dialog(following_count, "following")
 
         # Save the following list to a file in the json directory
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        following_file = f"{self.json_dir}/{self.username}_following_{timestamp}.json"
-        with open(following_file, 'w') as f:
-            json.dump(self.following_list, f)
+        following_file = self.save_list("following", self.following_list)
 
         print(f"Total following collected: {len(self.following_list)}")
         print(f"Results saved to {following_file}")
@@ -716,7 +2153,7 @@ class UnfollowTracker:
 
         try:
             # Go to profile page
-            self.driver.get(f"{self.URL}{self.username}/following/")
+            self.load_page(f"{self.URL}{self.username}/following/")
             self.random_sleep(3, 5)
 
             # Scroll the page to load more users
@@ -763,8 +2200,9 @@ class UnfollowTracker:
     def get_followers(self):
         """Get the list of followers with improved extraction"""
         print(f"Navigating to {self.username}'s profile to get followers list...")
-        self.driver.get(f"{self.URL}{self.username}/")
-        self.random_sleep(3, 5)
+        self.list_errors.pop("followers", None)
+        self.load_page(f"{self.URL}{self.username}/")
+        self.settle_page("followers_button")
         self.take_screenshot("profile_page_followers")
 
         # Get the count first with aggressive counting
@@ -783,33 +2221,7 @@ class UnfollowTracker:
                 '//*[contains(text(), " followers") or contains(text(), " Followers")]'
             ]
 
-            for selector in count_selectors:
-                elements = self.driver.find_elements(By.XPATH, selector)
-                for elem in elements:
-                    text = elem.text or elem.get_attribute('innerText')
-                    if text and ('followers' in text.lower() or
-                                 (text.isdigit() and int(text) > 0 and int(text) < 1000000)):
-                        count = self.get_count_from_text(text)
-                        if count > 0:
-                            followers_count = count
-                            print(f"Found count element with text: '{text}', extracted count: {count}")
-                            break
-                if followers_count > 0:
-                    break
-
-            # Last resort - manual scan of all elements with numbers
-            if followers_count == 0:
-                all_elements = self.driver.find_elements(By.XPATH, '//*')
-                for elem in all_elements:
-                    try:
-                        text = elem.text
-                        if text and 'followers' in text.lower():
-                            count = self.get_count_from_text(text)
-                            if count > 0:
-                                followers_count = count
-                                break
-                    except:
-                        continue
+            followers_count = self.read_profile_count(count_selectors, "followers", 1000000)
 
             print(f"Found approximately {followers_count} followers")
 
@@ -819,55 +2231,46 @@ class UnfollowTracker:
         # Take a screenshot with counts visible
         self.take_screenshot("profile_with_follower_counts")
 
-        # Click on the followers button with multiple approaches
-        followers_button_clicked = False
+        # Only responses triggered by opening the dialog are of interest
+        self.flush_network_log()
 
+        # Click on the followers button with multiple approaches
         # Find and click using multiple strategies
         click_strategies = [
             # Strategy 1: Direct click on "followers" text or link
-            lambda: self.click_element_by_xpath(
-                '//a[contains(@href, "/followers")] | //div[contains(text(), " followers")]'),
+            (self.click_element_by_xpath,
+             '//a[contains(@href, "/followers")] | //div[contains(text(), " followers")]'),
 
             # Strategy 2: Using JavaScript click with href selector
-            lambda: self.js_click_element_by_xpath('//a[contains(@href, "/followers")]'),
+            (self.js_click_element_by_xpath, '//a[contains(@href, "/followers")]'),
 
             # Strategy 3: Using the UI structure
-            lambda: self.click_element_by_xpath(
-                '//div[contains(@class, "x78zum5")]/../../div[1]//div | //div[contains(@class, "x9f619")]//div[contains(text(), "followers")]'),
+            (self.click_element_by_xpath,
+             '//div[contains(@class, "x78zum5")]/../../div[1]//div | //div[contains(@class, "x9f619")]//div[contains(text(), "followers")]'),
 
             # Strategy 4: Click on the count numbers
-            lambda: self.click_element_by_xpath('//section//ul//li[contains(., "followers")]'),
+            (self.click_element_by_xpath, '//section//ul//li[contains(., "followers")]'),
 
             # Strategy 5: Try a very broad selector as last resort
-            lambda: self.click_element_by_xpath('//*[contains(text(), "followers")]')
+            (self.click_element_by_xpath, '//*[contains(text(), "followers")]')
         ]
 
-        for i, click_strategy in enumerate(click_strategies):
-            try:
-                print(f"Trying followers button click strategy {i + 1}...")
-                if click_strategy():
-                    followers_button_clicked = True
-                    print(f"Successfully clicked followers using strategy {i + 1}")
-                    self.take_screenshot(f"followers_clicked_strategy_{i + 1}")
-                    break
-            except Exception as e:
-                print(f"Strategy {i + 1} failed: {e}")
+        followers_button_clicked = self.run_click_strategies("followers_button", "followers", click_strategies,
+                                                             confirm_xpath='//div[@role="dialog"]')
 
         if not followers_button_clicked:
             print("⚠️ Could not open followers list! Taking screenshot and continuing...")
+            self.list_errors["followers"] = "could not open the followers list"
             self.take_screenshot("followers_click_failed")
             return []
 
-        self.random_sleep(3, 5)
+        self.settle_page("scroll_box")
 
         # Extract usernames from the dialog
         self.followers_list = self.scrape_users_from_dialog(followers_count, "followers")
 
         # Save the followers list to a file in the json directory
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        followers_file = f"{self.json_dir}/{self.username}_followers_{timestamp}.json"
-        with open(followers_file, 'w') as f:
-            json.dump(self.followers_list, f)
+        followers_file = self.save_list("followers", self.followers_list)
 
         print(f"Total followers collected: {len(self.followers_list)}")
         print(f"Results saved to {followers_file}")
@@ -880,7 +2283,7 @@ class UnfollowTracker:
 
         try:
             # Go to profile page
-            self.driver.get(f"{self.URL}{self.username}/followers/")
+            self.load_page(f"{self.URL}{self.username}/followers/")
             self.random_sleep(3, 5)
 
             # Scroll the page to load more users
@@ -924,12 +2327,198 @@ class UnfollowTracker:
             print(f"Alternative method failed: {e}")
             return []
 
+    def list_file_path(self, list_type):
+        """Timestamped path for a list export in the configured output format"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return f"{self.json_dir}/{self.username}_{list_type}_{timestamp}.{self.output_format}"
+
+    def open_list_writer(self, list_type):
+        """Start streaming a list to disk as it is harvested, unless the output format is plain JSON"""
+        if self.output_format == "json":
+            return None
+        self.close_list_writer(list_type)
+        writer = ListWriter(self.list_file_path(list_type))
+        self.list_writers[list_type] = writer
+        return writer
+
+    def close_list_writer(self, list_type):
+        writer = self.list_writers.pop(list_type, None)
+        if writer:
+            writer.close()
+        return writer
+
+    def save_list(self, list_type, usernames):
+        """Save a username list to a timestamped file in the json directory.
+
+        If the list was streamed while it was harvested, the remaining usernames
+        are appended to that file instead of writing a new one.
+        """
+        writer = self.list_writers.pop(list_type, None)
+        if writer and writer.written.issubset(usernames):
+            writer.write(usernames)
+            writer.close()
+            output_file = writer.path
+        else:
+            if writer:
+                # The final list replaced what was harvested (e.g. an API fallback)
+                writer.close()
+                os.remove(writer.path)
+            output_file = self.list_file_path(list_type)
+            if self.output_format == "json":
+                with open(output_file, 'w') as f:
+                    json.dump(usernames, f)
+            else:
+                writer = ListWriter(output_file)
+                writer.write(usernames)
+                writer.close()
+
+        # Keep the delta history up to date. A partial list would show up as lost followers next time
+        if self.record_history and usernames and not self.is_list_complete(list_type):
+            print(f"Not recording the {list_type} list in the history: the scrape did not reach the end of the list.")
+        elif self.record_history and usernames:
+            try:
+                store = SnapshotStore(self.history_file)
+                baseline = not store.run_count(self.username, list_type)
+                added, removed = store.record_snapshot(self.username, list_type, usernames)
+                self.history_recorded.add(list_type)
+                if baseline:
+                    print(f"History started: first {list_type} snapshot with {len(usernames)} usernames")
+                else:
+                    print(f"History updated: {len(added)} added, {len(removed)} removed since the last {list_type} snapshot")
+            except Exception as e:
+                print(f"Error updating history: {e}")
+
+        return output_file
+
+    def is_list_complete(self, list_type):
+        """Whether a list was harvested to its end, so it is safe to record in the history"""
+        if list_type == "non_followers":
+            return self.is_list_complete("following") and self.is_list_complete("followers")
+        return self.list_complete.get(list_type, False)
+
+    def build_api_session(self):
+        """Create a connection-pooled HTTP session that reuses the browser's login cookies"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        csrf_token = ""
+        for cookie in self.driver.get_cookies():
+            # No domain, so the cookies also apply to a local mock server
+            session.cookies.set(cookie["name"], cookie["value"], path=cookie.get("path", "/"))
+            if cookie["name"] == "csrftoken":
+                csrf_token = cookie["value"]
+
+        session.headers.update({
+            "User-Agent": self.driver.execute_script("return navigator.userAgent"),
+            "X-IG-App-ID": self.api_app_id,
+            "X-CSRFToken": csrf_token,
+            "X-Requested-With": "XMLHttpRequest",
+            "Referer": self.URL,
+        })
+        self.api_session = session
+        return session
+
+    def get_own_user_id(self):
+        """Find the logged-in account's numeric user id"""
+        session = self.api_session or self.build_api_session()
+        user_id = session.cookies.get("ds_user_id")
+        if user_id:
+            return user_id
+
+        response = self.api_get("api/v1/users/web_profile_info/", {"username": self.username})
+        return response["data"]["user"]["id"]
+
+    def api_get(self, path, params=None):
+        """GET a JSON API path relative to api_base_url, backing off on rate limits and server errors"""
+        session = self.api_session or self.build_api_session()
+        url = f"{self.api_base_url.rstrip('/')}/{path.lstrip('/')}"
+
+        for attempt in range(self.api_max_retries + 1):
+            if self.request_limiter:
+                self.request_limiter.wait()
+            response = session.get(url, params=params, timeout=30)
+            if response.status_code == 429 or response.status_code >= 500:
+                if attempt == self.api_max_retries:
+                    break
+                wait = max(self.api_request_delay, 1.0) * (2 ** attempt)
+                print(f"API returned {response.status_code}. Retrying in {wait:.1f}s...")
+                time.sleep(wait)
+                continue
+            break
+
+        response.raise_for_status()
+        return response.json()
+
+    def fetch_user_list_api(self, list_type="following"):
+        """Page through the friendships endpoint with cursor pagination"""
+        user_id = self.get_own_user_id()
+        path = f"api/v1/friendships/{user_id}/{list_type}/"
+        params = {"count": self.api_page_size}
+        self.list_complete[list_type] = False
+
+        usernames = []
+        seen = set()
+        page = 0
+        while True:
+            started = time.time()
+            payload = self.api_get(path, params)
+            page += 1
+
+            for username, record_id in parse_user_records(payload, list_type):
+                if self.is_valid_username(username) and username not in seen:
+                    seen.add(username)
+                    usernames.append(username)
+                    if record_id:
+                        self.user_ids[username] = str(record_id)
+
+            print(f"[{list_type}] API page {page}: {len(usernames)} usernames collected")
+
+            next_max_id = payload.get("next_max_id")
+            if not next_max_id:
+                self.list_complete[list_type] = True
+                break
+            params["max_id"] = next_max_id
+
+            # Keep a bounded request rate
+            elapsed = time.time() - started
+            if elapsed < self.api_request_delay:
+                time.sleep(self.api_request_delay - elapsed)
+
+        return usernames
+
+    def get_following_api(self):
+        """Get the following list from the API, falling back to the dialog if that fails"""
+        print(f"Fetching {self.username}'s following list from the API...")
+        try:
+            self.following_list = self.fetch_user_list_api("following")
+        except Exception as e:
+            print(f"API fetch failed: {e}. Falling back to the following dialog...")
+            return self.get_following()
+
+        following_file = self.save_list("following", self.following_list)
+        print(f"Total following collected: {len(self.following_list)}")
+        print(f"Results saved to {following_file}")
+        return self.following_list
+
+    def get_followers_api(self):
+        """Get the followers list from the API, falling back to the dialog if that fails"""
+        print(f"Fetching {self.username}'s followers list from the API...")
+        try:
+            self.followers_list = self.fetch_user_list_api("followers")
+        except Exception as e:
+            print(f"API fetch failed: {e}. Falling back to the followers dialog...")
+            return self.get_followers()
+
+        followers_file = self.save_list("followers", self.followers_list)
+        print(f"Total followers collected: {len(self.followers_list)}")
+        print(f"Results saved to {followers_file}")
+        return self.followers_list
+
     def normalize_username(self, username):
         """Normalize username for better comparison"""
-        if not username:
-            return ""
-        # Convert to lowercase and remove non-alphanumeric characters
-        return re.sub(r'[^a-zA-Z0-9]', '', username.lower().strip())
+        return normalize_username(username)
 
     def find_non_followers(self, use_normalized_comparison=True):
         """Identify accounts that don't follow back with improved accuracy"""
@@ -944,62 +2533,33 @@ class UnfollowTracker:
             print("Followers list is empty. Getting it now...")
             self.get_followers()
 
-        # Deduplicate lists
-        self.following_list = list(set(self.following_list))
-        self.followers_list = list(set(self.followers_list))
+        # Deduplicate lists, keeping the scraped order
+        self.following_list = list(dict.fromkeys(self.following_list))
+        self.followers_list = list(dict.fromkeys(self.followers_list))
 
         # Print statistics before comparison
         print("\nComparison statistics:")
         print(f"- You are following: {len(self.following_list)} accounts")
         print(f"- You have: {len(self.followers_list)} followers")
 
-        # Better comparison with improved accuracy
         if use_normalized_comparison:
             print("Using normalized username comparison for better accuracy...")
-            # Create normalized versions of the lists for comparison
-            normalized_followers = [self.normalize_username(user) for user in self.followers_list if user]
-            normalized_following = [self.normalize_username(user) for user in self.following_list if user]
-
-            # Find non-followers with normalized comparison
-            self.not_following_back = []
-            for idx, user in enumerate(self.following_list):
-                if not user:
-                    continue
-
-                normalized_user = self.normalize_username(user)
-                if normalized_user and normalized_user not in normalized_followers:
-                    self.not_following_back.append(user)
-
-            # Secondary check to make sure we didn't miss any with direct comparison
-            direct_non_followers = set(self.following_list) - set(self.followers_list)
-            for user in direct_non_followers:
-                if user and user not in self.not_following_back:
-                    self.not_following_back.append(user)
         else:
-            # Simple direct comparison
             print("Using direct username comparison...")
-            self.not_following_back = [user for user in self.following_list if user and user not in self.followers_list]
 
-        # Verify our results with reverse check
+        self.not_following_back = compute_non_followers(self.following_list, self.followers_list,
+                                                        use_normalized_comparison)
+
+        # Report accounts that only matched once formatting differences were ignored
         if use_normalized_comparison:
-            print("Performing verification check...")
-            verified_non_followers = []
-            for user in self.not_following_back:
-                # Double check each non-follower
-                norm_user = self.normalize_username(user)
-                if norm_user and norm_user not in normalized_followers:
-                    verified_non_followers.append(user)
-
-            if len(verified_non_followers) != len(self.not_following_back):
-                print(
-                    f"⚠️ Verification removed {len(self.not_following_back) - len(verified_non_followers)} false positives.")
-                self.not_following_back = verified_non_followers
+            followers = set(self.followers_list)
+            direct_count = sum(1 for user in self.following_list if user and user not in followers)
+            if direct_count != len(self.not_following_back):
+                print(f"Normalized comparison matched {direct_count - len(self.not_following_back)} "
+                      f"accounts that differ only in formatting.")
 
         # Save the non-followers list to a file in the json directory
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_file = f"{self.json_dir}/{self.username}_non_followers_{timestamp}.json"
-        with open(output_file, 'w') as f:
-            json.dump(self.not_following_back, f)
+        output_file = self.save_list("non_followers", self.not_following_back)
 
         print(f"\nFound {len(self.not_following_back)} accounts that don't follow you back")
         print(f"Results saved to {output_file}")
@@ -1018,23 +2578,56 @@ class UnfollowTracker:
         print(f"\nTotal: {len(self.not_following_back)} accounts")
 
     def verify_non_followers(self, sample_size=10):
-        """Verify a sample of the non-followers by checking their profiles"""
+        """Verify a sample of the non-followers by checking their profiles.
+
+        Accounts with a fresh entry in the verification cache are not checked
+        again; the sample is drawn from unverified or stale accounts only.
+        Returns the confirmed non-followers, including ones confirmed from the cache.
+        """
         if not self.not_following_back:
             print("No non-followers to verify. Run find_non_followers() first.")
             return []
 
-        print(f"\nVerifying a sample of {min(sample_size, len(self.not_following_back))} accounts...")
+        cache = VerificationCache.shared(self.verification_cache_file, self.verify_cache_ttl,
+                                         self.verify_cache_size) if self.use_verification_cache else None
+
+        # Reuse fresh verdicts and spend the budget on everything else
+        cached = {}
+        due = []
+        for user in self.not_following_back:
+            entry = cache.get(self.username, user) if cache else None
+            if entry:
+                cached[user] = entry
+            else:
+                due.append(user)
+        if cached:
+            print(f"\n{len(cached)} accounts have fresh cached verification results.")
+
+        print(f"\nVerifying a sample of {min(sample_size, len(due))} accounts...")
 
         # Take a random sample of non-followers to verify
-        sample = random.sample(self.not_following_back, min(sample_size, len(self.not_following_back)))
+        sample = random.sample(due, min(sample_size, len(due)))
         verified_non_followers = []
         incorrect_results = []
 
-        for user in sample:
-            print(f"Verifying {user}...")
-            is_non_follower = self.manually_verify_non_follower(user)
+        results = {}
+        try:
+            if self.verify_workers > 1 and len(sample) > 1:
+                results.update(self.verify_concurrently(sample, self.verify_workers))
+            else:
+                for user in sample:
+                    print(f"Verifying {user}...")
+                    results[user] = self.verify_profile(user)
+        finally:
+            # Keep whatever was verified, even if the run was interrupted
+            if cache:
+                for user, result in results.items():
+                    if result["conclusive"]:
+                        cache.put(self.username, user, result["non_follower"], result["private"])
+                cache.save()
 
-            if is_non_follower:
+        for user in sample:
+            if results[user]["non_follower"]:
                 verified_non_followers.append(user)
             else:
                 incorrect_results.append(user)
@@ -1048,12 +2641,76 @@ class UnfollowTracker:
         if incorrect_results:
             print(f"- Incorrectly identified accounts (these actually do follow you): {incorrect_results}")
 
+        if cached:
+            cached_followers = [user for user, entry in cached.items() if not entry["non_follower"]]
+            print(f"- From cache: {len(cached) - len(cached_followers)} confirmed non-followers")
+            if cached_followers:
+                print(f"- From cache, these actually do follow you: {cached_followers}")
+            verified_non_followers += [user for user, entry in cached.items() if entry["non_follower"]]
+
         return verified_non_followers
 
+    def verify_concurrently(self, usernames, workers):
+        """Verify accounts across several logged-in browsers. Returns {username: verify_profile() result}"""
+        workers = min(workers, len(usernames))
+        print(f"Starting {workers - 1} extra browsers for verification...")
+
+        trackers = [self]
+        for i in range(workers - 1):
+            try:
+                trackers.append(self.spawn_worker(f"verify_worker_{i + 1}"))
+            except Exception as e:
+                print(f"Could not start verification browser {i + 1}: {e}")
+                break
+
+        # Each browser handles one account at a time; starts are rate limited across all of them
+        available = queue.Queue()
+        for tracker in trackers:
+            available.put(tracker)
+        limiter = RateLimiter(self.verify_interval)
+
+        def verify(user):
+            tracker = available.get()
+            try:
+                limiter.wait()
+                print(f"Verifying {user}...")
+                return tracker.verify_profile(user)
+            finally:
+                available.put(tracker)
+
+        results = {}
+        try:
+            with ThreadPoolExecutor(max_workers=len(trackers)) as pool:
+                futures = {pool.submit(verify, user): user for user in usernames}
+                for done, future in enumerate(as_completed(futures), 1):
+                    user = futures[future]
+                    try:
+                        results[user] = future.result()
+                    except Exception as e:
+                        print(f"Error verifying {user}: {e}")
+                        # Assume our list is correct
+                        results[user] = {"non_follower": True, "private": False, "conclusive": False}
+                    status = "does not follow you" if results[user]["non_follower"] else "follows you"
+                    print(f"[{done}/{len(usernames)}] {user} {status}")
+        finally:
+            for tracker in trackers[1:]:
+                tracker.close()
+
+        return results
+
     def manually_verify_non_follower(self, username):
         """Manually verify if a user is truly not following back by checking their following list"""
+        return self.verify_profile(username)["non_follower"]
+
+    def verify_profile(self, username):
+        """Check a profile's following list for our username.
+
+        Returns a dict with "non_follower" (the verdict, True when it can't be
+        checked), "private" and "conclusive" (False when an error forced the
+        verdict to default to our list being correct).
+        """
         try:
-            self.driver.get(f"{self.URL}{username}/")
+            self.load_page(f"{self.URL}{username}/")
             self.random_sleep(3, 5)
 
             # Check if account is private
@@ -1062,19 +2719,14 @@ class UnfollowTracker:
 
             if private_indicators:
                 print(f"Account {username} is private. Cannot verify.")
-                return True  # Assume our list is correct since we can't verify
+                # Assume our list is correct since we can't verify
+                return {"non_follower": True, "private": True, "conclusive": True}
 
             # Try to check the username's bio or profile info for verification
             try:
-                profile_sections = self.driver.find_elements(By.XPATH, '//*')
-                for section in profile_sections:
-                    try:
-                        text = section.text
-                        if text and self.username.lower() in text.lower():
-                            # If our username appears in their bio, they may be following us
-                            print(f"Found username mention in {username}'s profile. Manual verification recommended.")
-                    except:
-                        pass
+                if self.page_contains_text(self.username):
+                    # If our username appears in their bio, they may be following us
+                    print(f"Found username mention in {username}'s profile. Manual verification recommended.")
             except:
                 pass
 
@@ -1107,11 +2759,11 @@ class UnfollowTracker:
                             continue
             except Exception as e:
                 print(f"Could not open following list: {e}")
-                return True  # Assume our list is correct
+                return {"non_follower": True, "private": False, "conclusive": False}  # Assume our list is correct
 
             if not following_clicked:
                 print(f"Could not open following list for {username}")
-                return True
+                return {"non_follower": True, "private": False, "conclusive": False}
 
             self.random_sleep(3, 5)
 
@@ -1125,7 +2777,7 @@ class UnfollowTracker:
                 # Type the username character by character like a human
                 for char in self.username:
                     search_box.send_keys(char)
-                    time.sleep(random.uniform(0.05, 0.15))
+                    self.random_sleep(0.05, 0.15)
 
                 self.random_sleep(2, 3)
 
@@ -1143,7 +2795,7 @@ class UnfollowTracker:
                     search_box.clear()
                     for char in self.username.lower():
                         search_box.send_keys(char)
-                        time.sleep(random.uniform(0.05, 0.15))
+                        self.random_sleep(0.05, 0.15)
 
                     self.random_sleep(2, 3)
 
@@ -1164,10 +2816,10 @@ class UnfollowTracker:
 
                 if follows_you:
                     print(f"VERIFICATION ERROR: {username} actually follows you!")
-                    return False
+                    return {"non_follower": False, "private": False, "conclusive": True}
                 else:
                     print(f"Verified: {username} does not follow you.")
-                    return True
+                    return {"non_follower": True, "private": False, "conclusive": True}
 
             except Exception as e:
                 print(f"Error searching for your username: {e}")
@@ -1176,34 +2828,557 @@ class UnfollowTracker:
                     webdriver.ActionChains(self.driver).send_keys(Keys.ESCAPE).perform()
                 except:
                     pass
-                return True  # Assume our list is correct
+                return {"non_follower": True, "private": False, "conclusive": False}  # Assume our list is correct
 
         except Exception as e:
             print(f"Error verifying {username}: {e}")
-            return True  # Assume our list is correct
+            return {"non_follower": True, "private": False, "conclusive": False}  # Assume our list is correct
 
     def load_from_files(self, following_file=None, followers_file=None):
-        """Load following and followers lists from JSON files to avoid scraping again"""
+        """Load following and followers lists from JSON or NDJSON files to avoid scraping again"""
         if following_file:
             try:
-                with open(following_file, 'r') as f:
-                    self.following_list = json.load(f)
+                self.following_list = list(iter_usernames(following_file))
                 print(f"Loaded {len(self.following_list)} following accounts from {following_file}")
             except Exception as e:
                 print(f"Error loading following file: {e}")
 
         if followers_file:
             try:
-                with open(followers_file, 'r') as f:
-                    self.followers_list = json.load(f)
+                self.followers_list = list(iter_usernames(followers_file))
                 print(f"Loaded {len(self.followers_list)} followers from {followers_file}")
             except Exception as e:
                 print(f"Error loading followers file: {e}")
 
+    def find_non_followers_from_files(self, following_file, followers_file, use_normalized_comparison=True):
+        """Compare two list exports without building the username lists first.
+
+        Usernames are streamed from the files straight into the comparison,
+        which holds the follower keys, the following usernames seen so far (to
+        skip duplicates) and the result.
+        """
+        print("Finding accounts that don't follow you back...")
+        counts = {"following": 0, "followers": 0}
+
+        def counted(path, list_type):
+            for user in iter_usernames(path):
+                counts[list_type] += 1
+                yield user
+
+        try:
+            self.not_following_back = compute_non_followers(counted(following_file, "following"),
+                                                            counted(followers_file, "followers"),
+                                                            use_normalized_comparison)
+        except Exception as e:
+            print(f"Error reading list files: {e}")
+            return []
+
+        print("\nComparison statistics:")
+        print(f"- You are following: {counts['following']} accounts (from {following_file})")
+        print(f"- You have: {counts['followers']} followers (from {followers_file})")
+
+        output_file = self.save_list("non_followers", self.not_following_back)
+
+        print(f"\nFound {len(self.not_following_back)} accounts that don't follow you back")
+        print(f"Results saved to {output_file}")
+
+        return self.not_following_back
+
+    def spawn_worker(self, name="worker"):
+        """Start another browser with the same settings, signed in with this browser's cookies"""
+        worker = UnfollowTracker(self.username, self.password, headless=self.headless,
+                                 capture_network=self.capture_network, lean=self.lean)
+        for attr in ("URL", "interactive", "scroll_timeout", "stable_threshold", "scroll_delay", "harvest_mode",
+                     "checkpoint_interval", "resume", "checkpoints_dir", "adaptive_pacing",
+                     "min_scroll_delay", "max_scroll_delay", "prune_rows", "prune_keep",
+                     "history_file", "record_history",
+                     "incremental", "incremental_overlap", "incremental_tolerance",
+                     "capture_dir", "api_base_url", "api_page_size", "api_request_delay",
+                     "api_max_retries", "debug", "screenshot_format", "screenshot_quality",
+                     "screenshot_interval", "max_screenshots", "output_format", "base_dir", "json_dir",
+                     "request_limiter"):
+            setattr(worker, attr, getattr(self, attr))
+
+        # Keep the worker's screenshots apart from ours
+        worker.screenshots_dir = os.path.join(self.screenshots_dir, name)
+        os.makedirs(worker.screenshots_dir, exist_ok=True)
+
+        if self.instrumentation:
+            worker.enable_instrumentation(self.instrumentation)
+
+        worker.copy_session_from(self)
+        return worker
+
+    def copy_session_from(self, other):
+        """Load another tracker's cookies into this browser so it is logged in too"""
+        # Cookies can only be added for the domain currently loaded
+        self.load_page(self.URL)
+        for cookie in other.driver.get_cookies():
+            cookie = dict(cookie)
+            if cookie.get("sameSite") not in ("Strict", "Lax", "None"):
+                cookie.pop("sameSite", None)
+            try:
+                self.driver.add_cookie(cookie)
+            except Exception as e:
+                print(f"Could not copy cookie {cookie.get('name')}: {e}")
+        self.driver.refresh()
+        self.random_sleep(2, 3)
+
+    def scan_parallel(self, use_api=False):
+        """Extract following and followers at the same time, each in its own browser"""
+        print("Starting a second browser for the followers list...")
+        worker = self.spawn_worker("followers_worker")
+
+        try:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                following_future = pool.submit(self.get_following_api if use_api else self.get_following)
+                followers_future = pool.submit(worker.get_followers_api if use_api else worker.get_followers)
+
+                self.following_list = following_future.result()
+                self.followers_list = followers_future.result()
+            self.user_ids.update(worker.user_ids)
+            self.list_complete.update(worker.list_complete)
+            self.list_errors.update(worker.list_errors)
+            self.history_recorded.update(worker.history_recorded)
+        finally:
+            worker.close()
+
+        print(f"Parallel scan complete: {len(self.following_list)} following, {len(self.followers_list)} followers")
+        return self.following_list, self.followers_list
+
     def close(self):
         """Close the browser and clean up"""
-        print("Closing browser...")
-        self.driver.quit()
+        if self.screenshot_writer:
+            self.screenshot_writer.close()
+            self.screenshot_writer = None
+        for list_type in list(self.list_writers):
+            self.close_list_writer(list_type)
+        if self._driver is not None:
+            print("Closing browser...")
+            self._driver.quit()
+            self._driver = None
+            self._wait = None
+
+
+class ScanError(Exception):
+    """A list could not be scraped (e.g. its dialog never opened)"""
+
+
+def run_scan(bot, mode="full", use_api=False, parallel=False, verify=False, verify_count=5, strict=False):
+    """Run one scan on a logged-in tracker and return a summary of the results.
+
+    With strict, a list that could not be scraped raises ScanError instead of
+    being reported as empty, so callers can retry.
+    """
+    bot.following_list = []
+    bot.followers_list = []
+    bot.not_following_back = []
+    bot.list_errors = {}
+    bot.history_recorded = set()
+
+    get_following = bot.get_following_api if use_api else bot.get_following
+    get_followers = bot.get_followers_api if use_api else bot.get_followers
+
+    def check(*list_types):
+        errors = [f"{list_type}: {bot.list_errors[list_type]}" for list_type in list_types
+                  if bot.list_errors.get(list_type)]
+        if strict and errors:
+            raise ScanError("; ".join(errors))
+
+    def show_history_report():
+        # Only report changes this run recorded, not the ones left over from the last complete scan
+        if not bot.record_history:
+            return
+        if {"following", "followers", "non_followers"} <= bot.history_recorded:
+            print_history_report(SnapshotStore(bot.history_file), bot.username)
+        else:
+            print("\nNot showing changes since the last run: this run's lists were incomplete and weren't recorded.")
+
+    # Handle the different scan options
+    if mode == "following":
+        get_following()
+        check("following")
+    elif mode == "followers":
+        get_followers()
+        check("followers")
+    elif parallel:
+        print("\n== STEP 1+2: Getting your following and followers lists in parallel ==")
+        bot.scan_parallel(use_api=use_api)
+        check("following", "followers")
+
+        print("\n== STEP 3: Finding who doesn't follow you back ==")
+        bot.find_non_followers(use_normalized_comparison=True)
+        bot.show_results()
+        show_history_report()
+    else:  # Full scan is default
+        print("\n== STEP 1: Getting your following list ==")
+        get_following()
+        check("following")
+
+        print("\n== STEP 2: Getting your followers list ==")
+        get_followers()
+        check("followers")
+
+        print("\n== STEP 3: Finding who doesn't follow you back ==")
+        bot.find_non_followers(use_normalized_comparison=True)
+        bot.show_results()
+        show_history_report()
+
+    # Optional verification step
+    verified = []
+    if verify:
+        print(f"\n== Verifying {verify_count} non-followers ==")
+        verified = bot.verify_non_followers(verify_count)
+
+    return {
+        "username": bot.username,
+        "mode": mode,
+        "following_count": len(bot.following_list),
+        "followers_count": len(bot.followers_list),
+        "non_followers": list(bot.not_following_back),
+        "verified_non_followers": verified,
+    }
+
+
+# -------- Warm browser daemon --------
+DAEMON_PORT = 47321
+DAEMON_CLIENT_TIMEOUT = 10  # Seconds a client may take to send its request
+
+
+def daemon_info_file(base_dir, port):
+    """Where a running daemon publishes its port and access token"""
+    return os.path.join(base_dir, f"daemon_{port}.json")
+
+
+def send_message(sock, message):
+    """Send one newline-delimited JSON message"""
+    sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+
+def read_message(sock):
+    """Read one newline-delimited JSON message"""
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return json.loads(data.decode("utf-8")) if data.strip() else {}
+
+
+class TrackerDaemon:
+    """Keeps one logged-in browser warm and runs scans for CLI invocations over a local socket"""
+
+    def __init__(self, bot, port=DAEMON_PORT):
+        self.bot = bot
+        self.port = port
+        self.token = secrets.token_hex(16)
+        self.info_file = daemon_info_file(bot.base_dir, port)
+        self.client_timeout = DAEMON_CLIENT_TIMEOUT
+        self.running = False
+
+    def serve_forever(self):
+        """Accept commands until a shutdown request (or Ctrl-C)"""
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(("127.0.0.1", self.port))
+        server.listen(5)
+
+        # Only clients that can read this file may drive the browser
+        fd = os.open(self.info_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({"port": self.port, "token": self.token, "username": self.bot.username, "pid": os.getpid()}, f)
+
+        print(f"Daemon ready for {self.bot.username} on 127.0.0.1:{self.port}. Attach with --attach.")
+        self.running = True
+        try:
+            while self.running:
+                conn, _ = server.accept()
+                # A client that stalls mid-request must not block the daemon
+                conn.settimeout(self.client_timeout)
+                with conn:
+                    self.handle(conn)
+        finally:
+            server.close()
+            try:
+                os.remove(self.info_file)
+            except OSError:
+                pass
+
+    def handle(self, conn):
+        """Run a single client request and send back the response"""
+        try:
+            request = read_message(conn)
+        except socket.timeout:
+            print("Client sent no complete request in time. Closing the connection.")
+            return
+        except Exception as e:
+            send_message(conn, {"ok": False, "error": f"Bad request: {e}"})
+            return
+
+        if request.get("token") != self.token:
+            send_message(conn, {"ok": False, "error": "Invalid daemon token"})
+            return
+
+        command = request.get("command")
+        try:
+            if command == "ping":
+                send_message(conn, {"ok": True, "username": self.bot.username})
+            elif command == "shutdown":
+                self.running = False
+                send_message(conn, {"ok": True})
+            elif command == "scan":
+                # The warm browser may have been logged out since the last scan
+                if not self.bot.driver.get_cookie("sessionid") and not self.bot.ensure_logged_in():
+                    send_message(conn, {"ok": False, "error": "Login failed"})
+                    return
+                options = request.get("options", {})
+                summary = run_scan(self.bot, options.get("mode", "full"),
+                                   use_api=options.get("use_api", False),
+                                   parallel=options.get("parallel", False),
+                                   verify=options.get("verify", False),
+                                   verify_count=options.get("verify_count", 5))
+                send_message(conn, {"ok": True, "result": summary})
+            else:
+                send_message(conn, {"ok": False, "error": f"Unknown command: {command}"})
+        except Exception as e:
+            print(f"Daemon command {command} failed: {e}")
+            send_message(conn, {"ok": False, "error": str(e)})
+
+
+def send_daemon_command(command, port=DAEMON_PORT, base_dir="instagram_data", **options):
+    """Send a command to a running daemon and wait for its response"""
+    with open(daemon_info_file(base_dir, port), 'r') as f:
+        info = json.load(f)
+
+    with socket.create_connection(("127.0.0.1", info["port"])) as sock:
+        send_message(sock, {"token": info["token"], "command": command, "options": options})
+        return read_message(sock)
+
+
+def attach_to_daemon(args, scan_mode):
+    """Run the requested scan on a warm daemon instead of launching a browser"""
+    try:
+        if args.stop_daemon:
+            response = send_daemon_command("shutdown", args.daemon_port)
+            print("Daemon stopped." if response.get("ok") else f"Could not stop daemon: {response.get('error')}")
+            return
+
+        print(f"Attaching to daemon on port {args.daemon_port}...")
+        response = send_daemon_command("scan", args.daemon_port, mode=scan_mode, use_api=args.use_api,
+                                       parallel=args.parallel, verify=args.verify, verify_count=args.verify_count)
+    except (OSError, ValueError) as e:
+        print(f"No daemon reachable on port {args.daemon_port} ({e}). Start one with --daemon.")
+        return
+
+    if not response.get("ok"):
+        print(f"Daemon scan failed: {response.get('error')}")
+        return
+
+    result = response["result"]
+    print(f"- You are following: {result['following_count']} accounts")
+    print(f"- You have: {result['followers_count']} followers")
+    if result["mode"] == "full":
+        print("\n===== ACCOUNTS NOT FOLLOWING YOU BACK =====")
+        for i, user in enumerate(result["non_followers"], 1):
+            print(f"{i}. {user}")
+        print(f"\nTotal: {len(result['non_followers'])} accounts")
+
+
+def configure_tracker(bot, args):
+    """Apply the command line settings to a tracker"""
+    bot.debug = args.debug
+    bot.output_format = args.output_format
+    bot.screenshot_format = args.screenshot_format
+    bot.screenshot_quality = args.screenshot_quality
+    bot.screenshot_interval = args.screenshot_interval
+    bot.max_screenshots = args.max_screenshots
+    bot.use_session_cache = not args.no_session_cache
+    bot.interactive = not args.non_interactive
+    # Re-analysing old exports shouldn't add snapshots to the history
+    bot.record_history = not args.no_history and not args.load_files
+
+    # Set custom scrolling parameters
+    bot.scroll_timeout = args.scroll_timeout
+    bot.stable_threshold = args.stable_threshold
+    bot.scroll_delay = args.scroll_delay
+    bot.harvest_mode = args.harvest_mode
+    bot.capture_dir = args.capture_dir
+    bot.resume = args.resume
+    bot.incremental = args.incremental
+    bot.incremental_overlap = args.incremental_overlap
+    bot.incremental_tolerance = args.incremental_tolerance
+    bot.adaptive_pacing = args.adaptive_pacing
+    bot.prune_rows = args.prune_rows
+    bot.prune_keep = args.prune_keep
+    bot.verify_workers = args.verify_workers
+    bot.verify_interval = args.verify_interval
+    bot.use_verification_cache = not args.no_verify_cache
+    bot.verify_cache_ttl = args.verify_cache_ttl * 3600
+    bot.verify_cache_size = args.verify_cache_size
+    bot.min_scroll_delay = args.min_scroll_delay
+    bot.max_scroll_delay = args.max_scroll_delay
+    bot.api_request_delay = args.api_delay
+    bot.request_limiter = RateLimiter(args.request_interval) if args.request_interval else None
+    if args.api_base_url:
+        bot.api_base_url = args.api_base_url
+
+
+# -------- Multi-account batch scans --------
+def default_batch_workers():
+    """How many browsers to run at once: one per two cores, limited to about 1 GB of RAM each"""
+    workers = max(1, (os.cpu_count() or 2) // 2)
+    try:
+        memory_gb = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 1024 ** 3
+        workers = min(workers, max(1, int(memory_gb)))
+    except (ValueError, OSError, AttributeError):
+        pass
+    return workers
+
+
+def load_batch_config(path):
+    """Read a batch config: {"defaults": {...}, "accounts": [{"username": ..., "password": ...}, ...]}
+
+    Account entries may override any key from "defaults". A plain list of
+    accounts is accepted too.
+    """
+    with open(path, 'r') as f:
+        config = json.load(f)
+    if isinstance(config, list):
+        config = {"accounts": config}
+
+    defaults = config.get("defaults", {})
+    accounts = []
+    for entry in config.get("accounts", []):
+        if not entry.get("username"):
+            raise ValueError(f"Batch account entry without a username: {entry}")
+        account = dict(defaults)
+        account.update(entry)
+        accounts.append(account)
+    return accounts
+
+
+def scan_account(account, args, start_limiter, instrumentation=None):
+    """Scan one batch account, retrying with exponential backoff. Returns a summary dict"""
+    username = account["username"]
+    summary = {"username": username, "status": "failed", "attempts": 0, "error": None}
+    started = time.time()
+
+    # Don't rescan an account that was scanned recently
+    min_interval = account.get("min_interval_minutes", 0) * 60
+    if min_interval and not args.no_history:
+        store = SnapshotStore(os.path.join("instagram_data", "history.sqlite3"))
+        runs = [store.latest_run(username, list_type) for list_type in ("following", "followers")]
+        taken = [datetime.fromisoformat(run[1]).timestamp() for run in runs if run]
+        if taken and time.time() - max(taken) < min_interval:
+            summary["status"] = "skipped"
+            summary["error"] = f"scanned less than {account['min_interval_minutes']} minutes ago"
+            return summary
+
+    retries = account.get("retries", 2)
+    retry_delay = account.get("retry_delay", 60)
+    for attempt in range(retries + 1):
+        summary["attempts"] = attempt + 1
+        if attempt:
+            delay = retry_delay * (2 ** (attempt - 1))
+            print(f"[batch] Retrying {username} in {delay:.0f}s (attempt {attempt + 1}/{retries + 1})")
+            time.sleep(delay)
+
+        # Stagger browser launches and logins across the pool
+        start_limiter.wait()
+        bot = None
+        try:
+            bot = UnfollowTracker(username, account.get("password"),
+                                  headless=account.get("headless", True),
+                                  capture_network=account.get("harvest_mode", args.harvest_mode) == "network",
+                                  profile_dir=account.get("profile_dir"),
+                                  lean=account.get("lean", not args.no_lean))
+            configure_tracker(bot, args)
+            bot.interactive = False
+            bot.use_session_cache = True
+            # Accounts share the screenshots directory, so keep each one's files apart
+            bot.screenshots_dir = os.path.join(bot.screenshots_dir, username)
+            os.makedirs(bot.screenshots_dir, exist_ok=True)
+            request_interval = account.get("request_interval", args.request_interval)
+            bot.request_limiter = RateLimiter(request_interval) if request_interval else None
+            for key, attr in (("scroll_delay", "scroll_delay"), ("harvest_mode", "harvest_mode"),
+                              ("api_delay", "api_request_delay"), ("output_format", "output_format"),
+                              ("incremental", "incremental")):
+                if key in account:
+                    setattr(bot, attr, account[key])
+            if instrumentation:
+                bot.enable_instrumentation(instrumentation)
+
+            if not bot.ensure_logged_in():
+                raise RuntimeError("login failed")
+
+            result = run_scan(bot, account.get("mode", "full"), use_api=account.get("use_api", False),
+                              verify=account.get("verify", False), verify_count=account.get("verify_count", 5),
+                              strict=True)
+            summary.update(result)
+            summary["non_followers"] = len(result["non_followers"])
+            summary["verified_non_followers"] = len(result["verified_non_followers"])
+            summary["status"] = "ok"
+            summary["error"] = None
+            break
+        except Exception as e:
+            print(f"[batch] {username} failed: {e}")
+            summary["error"] = str(e)
+        finally:
+            if bot:
+                try:
+                    bot.close()
+                except Exception as e:
+                    print(f"[batch] Error closing browser for {username}: {e}")
+
+    summary["duration"] = round(time.time() - started, 1)
+    return summary
+
+
+def run_batch(args):
+    """Scan every account in the batch config on a bounded pool of browsers"""
+    accounts = load_batch_config(args.batch)
+    workers = args.batch_workers or default_batch_workers()
+    workers = max(1, min(workers, len(accounts)))
+    print(f"Batch scan of {len(accounts)} accounts with up to {workers} browsers at once")
+
+    instrumentation = Instrumentation() if args.metrics else None
+    start_limiter = RateLimiter(args.batch_start_interval)
+    summaries = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(scan_account, account, args, start_limiter, instrumentation): account["username"]
+                   for account in accounts}
+        for future in as_completed(futures):
+            summary = future.result()
+            summaries.append(summary)
+            print(f"[batch] {summary['username']}: {summary['status']} "
+                  f"({len(summaries)}/{len(accounts)} done)")
+
+    # Keep the config order in the report
+    order = {account["username"]: i for i, account in enumerate(accounts)}
+    summaries.sort(key=lambda summary: order[summary["username"]])
+
+    print("\n===== BATCH SUMMARY =====")
+    for summary in summaries:
+        if summary["status"] == "ok":
+            print(f"{summary['username']}: {summary['following_count']} following, "
+                  f"{summary['followers_count']} followers, {summary['non_followers']} not following back "
+                  f"({summary['duration']}s, {summary['attempts']} attempt(s))")
+        else:
+            print(f"{summary['username']}: {summary['status']} - {summary['error']}")
+    ok = sum(1 for summary in summaries if summary["status"] == "ok")
+    print(f"\n{ok}/{len(summaries)} accounts scanned successfully")
+
+    os.makedirs("instagram_data", exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    summary_file = os.path.join("instagram_data", f"batch_summary_{timestamp}.json")
+    with open(summary_file, 'w') as f:
+        json.dump(summaries, f, indent=2)
+    print(f"Summary saved to {summary_file}")
+
+    if instrumentation:
+        instrumentation.write_report(os.path.join("instagram_data", "metrics"), args.metrics_format)
+    return summaries
 
 
 # -------- Command Line Interface --------
@@ -1212,12 +3387,34 @@ def main():
     parser = argparse.ArgumentParser(description="Instagram Followers Analysis Tool")
 
     # Required credentials
-    parser.add_argument("--username", required=True, help="Your Instagram username")
-    parser.add_argument("--password", required=True, help="Your Instagram password")
+    parser.add_argument("--username", help="Your Instagram username (required unless using --batch)")
+    parser.add_argument("--password", help="Your Instagram password (not needed with --attach or --load-files)")
 
     # Optional behavior flags
     parser.add_argument("--headless", action="store_true", help="Run in headless mode without browser UI")
     parser.add_argument("--debug", action="store_true", help="Enable debug mode with screenshots")
+    parser.add_argument("--no-lean", action="store_true",
+                        help="Load images, video and analytics and wait for full page loads (useful for debugging)")
+    parser.add_argument("--screenshot-format", choices=["png", "jpeg", "webp"], default="png",
+                        help="Image format for debug screenshots (default: png)")
+    parser.add_argument("--screenshot-quality", type=int, default=80,
+                        help="Quality of jpeg/webp debug screenshots, 0-100 (default: 80)")
+    parser.add_argument("--screenshot-interval", type=float, default=0.5,
+                        help="Minimum seconds between debug screenshots (default: 0.5)")
+    parser.add_argument("--max-screenshots", type=int, default=200,
+                        help="Debug screenshots to keep on disk; older ones are deleted (default: 200)")
+    parser.add_argument("--no-session-cache", action="store_true",
+                        help="Always log in with credentials instead of reusing the saved browser session")
+    parser.add_argument("--non-interactive", action="store_true",
+                        help="Never wait for Enter during login (for scheduled runs)")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Time WebDriver commands, sleeps and phases and write a report to instagram_data/metrics")
+    parser.add_argument("--metrics-format", choices=["json", "prometheus"], default="json",
+                        help="Metrics report format (default: json)")
+    parser.add_argument("--output-format", choices=OUTPUT_FORMATS, default="json",
+                        help="Format of saved lists; NDJSON formats are written while scrolling (default: json)")
+    parser.add_argument("--no-history", action="store_true",
+                        help="Don't record this run in the snapshot history (instagram_data/history.sqlite3)")
 
     # Operation mode options
     operation_group = parser.add_argument_group("Operation Mode")
@@ -1226,6 +3423,11 @@ def main():
     operation_group.add_argument("--followers-only", action="store_true", help="Only get followers list")
     operation_group.add_argument("--load-files", action="store_true",
                                  help="Load from existing files instead of scraping")
+    operation_group.add_argument("--history", action="store_true",
+                                 help="Show changes recorded by the latest scans and exit (no browser needed)")
+    operation_group.add_argument("--parallel", action="store_true",
+                                 help="Full scan with following and followers extracted at the same time "
+                                      "in two browsers")
 
     # File loading options
     files_group = parser.add_argument_group("File Options")
@@ -1236,6 +3438,16 @@ def main():
     verify_group = parser.add_argument_group("Verification Options")
     verify_group.add_argument("--verify", action="store_true", help="Verify a sample of non-followers")
     verify_group.add_argument("--verify-count", type=int, default=5, help="Number of accounts to verify (default: 5)")
+    verify_group.add_argument("--verify-workers", type=int, default=1,
+                              help="Browsers to verify with in parallel (default: 1)")
+    verify_group.add_argument("--verify-cache-ttl", type=float, default=168,
+                              help="Hours before a cached verification result is checked again (default: 168)")
+    verify_group.add_argument("--verify-cache-size", type=int, default=10000,
+                              help="Maximum number of cached verification results (default: 10000)")
+    verify_group.add_argument("--no-verify-cache", action="store_true",
+                              help="Verify every sampled account even if it was checked recently")
+    verify_group.add_argument("--verify-interval", type=float, default=2.0,
+                              help="Minimum seconds between verification starts across all browsers (default: 2.0)")
 
     # Scrolling options
     scroll_group = parser.add_argument_group("Scrolling Options")
@@ -1245,18 +3457,107 @@ def main():
                               help="Number of stable scrolls before stopping (default: 10)")
     scroll_group.add_argument("--scroll-delay", type=float, default=2.0,
                               help="Delay between scrolls in seconds (default: 2.0)")
+    scroll_group.add_argument("--harvest-mode", choices=["js", "observer", "network", "webdriver"], default="js",
+                              help="How usernames are read from the dialog: one in-page script per scroll (js), "
+                                   "a MutationObserver that streams new rows as they load (observer), "
+                                   "the list API responses captured over CDP (network), "
+                                   "or one WebDriver call per link (webdriver) (default: js)")
+    scroll_group.add_argument("--adaptive-pacing", action="store_true",
+                              help="Tune the scroll delay to how fast rows load instead of using a fixed delay")
+    scroll_group.add_argument("--min-scroll-delay", type=float, default=0.2,
+                              help="Lower bound for --adaptive-pacing in seconds (default: 0.2)")
+    scroll_group.add_argument("--max-scroll-delay", type=float, default=8.0,
+                              help="Upper bound for --adaptive-pacing in seconds (default: 8.0)")
+    scroll_group.add_argument("--prune-rows", action="store_true",
+                              help="Remove harvested rows from the dialog so browser memory and per-scroll cost stay "
+                                   "flat on long lists (js, observer and network harvest modes)")
+    scroll_group.add_argument("--prune-keep", type=int, default=30,
+                              help="Rows left in the dialog when pruning (default: 30)")
+    scroll_group.add_argument("--resume", action="store_true",
+                              help="Continue an interrupted scrape from its checkpoint in instagram_data/checkpoints")
+    scroll_group.add_argument("--incremental", action="store_true",
+                              help="Scroll only until the newest rows reach the previous saved snapshot, then merge "
+                                   "it in; falls back to a full scrape if the result doesn't match the profile count")
+    scroll_group.add_argument("--incremental-overlap", type=int, default=30,
+                              help="Consecutive already-known usernames that end an incremental scrape (default: 30)")
+    scroll_group.add_argument("--incremental-tolerance", type=int, default=0,
+                              help="Allowed difference between an incremental result and the profile count; "
+                                   "counts shown rounded like 12.3K already allow for their rounding (default: 0)")
+    scroll_group.add_argument("--capture-dir",
+                              help="Record captured list responses to this directory (for --harvest-mode network)")
+
+    # API options
+    api_group = parser.add_argument_group("API Options")
+    api_group.add_argument("--use-api", action="store_true",
+                           help="Fetch lists through the friendships API with the browser's session instead of scrolling")
+    api_group.add_argument("--api-base-url", help="Base URL for API requests (default: Instagram)")
+    api_group.add_argument("--api-delay", type=float, default=1.0,
+                           help="Minimum delay between API page requests in seconds (default: 1.0)")
+    api_group.add_argument("--request-interval", type=float, default=0.0,
+                           help="Minimum seconds between this account's page loads and API requests, "
+                                "shared by all of its browsers (default: 0, no pacing)")
+
+    # Daemon options
+    daemon_group = parser.add_argument_group("Daemon Options")
+    daemon_group.add_argument("--daemon", action="store_true",
+                              help="Log in once and keep the browser running for --attach invocations")
+    daemon_group.add_argument("--attach", action="store_true",
+                              help="Run the scan on a running daemon instead of starting a browser")
+    daemon_group.add_argument("--stop-daemon", action="store_true", help="Shut down a running daemon")
+    daemon_group.add_argument("--daemon-port", type=int, default=DAEMON_PORT,
+                              help=f"Local port for the daemon control socket (default: {DAEMON_PORT})")
+    daemon_group.add_argument("--profile-dir",
+                              help="Persistent Chrome profile directory "
+                                   "(default with --daemon: instagram_data/chrome_profile/USERNAME)")
+
+    # Batch options
+    batch_group = parser.add_argument_group("Batch Options")
+    batch_group.add_argument("--batch", metavar="CONFIG",
+                             help="Scan every account in a JSON config file (see README)")
+    batch_group.add_argument("--batch-workers", type=int,
+                             help="Maximum browsers running at once (default: based on CPU cores and RAM)")
+    batch_group.add_argument("--batch-start-interval", type=float, default=5.0,
+                             help="Minimum seconds between browser launches in a batch (default: 5)")
 
     # Parse arguments
     args = parser.parse_args()
 
-    # Initialize the bot
-    bot = UnfollowTracker(args.username, args.password, headless=args.headless)
-    bot.debug = args.debug
+    if args.batch:
+        run_batch(args)
+        return
 
-    # Set custom scrolling parameters
-    bot.scroll_timeout = args.scroll_timeout
-    bot.stable_threshold = args.stable_threshold
-    bot.scroll_delay = args.scroll_delay
+    if not args.username:
+        parser.error("--username is required unless using --batch")
+
+    if args.following_only:
+        scan_mode = "following"
+    elif args.followers_only:
+        scan_mode = "followers"
+    else:
+        scan_mode = "full"
+
+    if args.attach or args.stop_daemon:
+        attach_to_daemon(args, scan_mode)
+        return
+
+    if args.history:
+        print_history_report(SnapshotStore(os.path.join("instagram_data", "history.sqlite3")), args.username)
+        return
+
+    if not args.password and not args.load_files:
+        parser.error("--password is required unless using --attach or --load-files")
+
+    profile_dir = args.profile_dir
+    if args.daemon and not profile_dir:
+        profile_dir = os.path.join("instagram_data", "chrome_profile", args.username)
+
+    # Initialize the bot
+    bot = UnfollowTracker(args.username, args.password, headless=args.headless,
+                          capture_network=args.harvest_mode == "network", profile_dir=profile_dir,
+                          lean=not args.no_lean)
+    configure_tracker(bot, args)
+    if args.metrics:
+        bot.enable_instrumentation()
 
     try:
         # Handle different operation modes
@@ -1266,42 +3567,34 @@ def main():
                 parser.error("--load-files requires both --following-file and --followers-file")
 
             print("Loading from existing files...")
-            bot.load_from_files(args.following_file, args.followers_file)
-            bot.find_non_followers()
+            bot.find_non_followers_from_files(args.following_file, args.followers_file)
             bot.show_results()
 
+            # Optional verification step
+            if args.verify:
+                print(f"\n== Verifying {args.verify_count} non-followers ==")
+                bot.verify_non_followers(args.verify_count)
+
         else:
             # Login first (required for all scraping operations)
-            if not bot.login():
+            if not bot.ensure_logged_in():
                 print("Login failed. Exiting.")
                 return
 
-            # Handle the different scan options
-            if args.following_only:
-                bot.get_following()
-            elif args.followers_only:
-                bot.get_followers()
-            else:  # Full scan is default
-                print("\n== STEP 1: Getting your following list ==")
-                bot.get_following()
-
-                print("\n== STEP 2: Getting your followers list ==")
-                bot.get_followers()
-
-                print("\n== STEP 3: Finding who doesn't follow you back ==")
-                bot.find_non_followers(use_normalized_comparison=True)
-                bot.show_results()
-
-        # Optional verification step
-        if args.verify:
-            print(f"\n== Verifying {args.verify_count} non-followers ==")
-            bot.verify_non_followers(args.verify_count)
+            if args.daemon:
+                TrackerDaemon(bot, args.daemon_port).serve_forever()
+            else:
+                run_scan(bot, scan_mode, use_api=args.use_api, parallel=args.parallel,
+                         verify=args.verify, verify_count=args.verify_count)
 
     except KeyboardInterrupt:
         print("\nOperation cancelled by user.")
+        print("Partial lists were checkpointed. Run again with --resume to continue.")
     except Exception as e:
         print(f"An error occurred: {e}")
     finally:
+        if bot.instrumentation:
+            bot.instrumentation.write_report(bot.metrics_dir, args.metrics_format)
         bot.close()
 
 
@@ -0,0 +1,547 @@
+"""Local stand-in for the parts of Instagram the tracker talks to.
+
+Serves a login page, profile pages with follower/following counts, a lazily
+paginated following/followers dialog backed by a friendships-style JSON API,
+and a search box for verification. List size, page latency, DOM layout,
+row virtualization and failures are all configurable, and the generated
+ground truth is exposed so scrapes can be scored for completeness.
+
+Usage:
+    python mock_instagram.py --port 8000 --following 2000 --followers 1800
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import string
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+OWNER_ID = "1"
+
+# Smallest valid GIF, served for every avatar
+AVATAR_BYTES = (b"GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00\x00\x00\x00"
+                b",\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;")
+
+RESERVED_NAMES = {'explore', 'p', 'reels', 'stories', 'direct', 'tags', 'about', 'accounts', 'legal',
+                  'directory', 'hashtag', 'login', 'signup', 'download', 'help', 'privacy', 'terms',
+                  'api', 'press', 'jobs', 'locations', 'media', 'logging'}
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<meta property="og:description" content="__DESCRIPTION__">
+<style>
+body { font-family: sans-serif; margin: 0; }
+header { padding: 20px; }
+header ul { list-style: none; display: flex; gap: 24px; padding: 0; }
+.row { display: flex; align-items: center; gap: 8px; height: 56px; padding: 0 12px; }
+.row img { width: 44px; height: 44px; border-radius: 22px; background: #ddd; }
+div[role="dialog"] { position: fixed; top: 10%; left: 30%; width: 40%; background: #fff;
+                      border: 1px solid #ccc; border-radius: 12px; }
+</style>
+</head>
+<body>
+<div class="x9f619">__BODY__</div>
+<script>
+var CONFIG = __CONFIG__;
+__SCRIPT__
+</script>
+</body>
+</html>
+"""
+
+LOGIN_BODY = """
+<form method="post" action="/accounts/login/">
+  <input name="username" type="text" placeholder="Phone number, username, or email">
+  <input name="password" type="password" placeholder="Password">
+  <button type="submit">Log in</button>
+</form>
+"""
+
+HOME_BODY = """
+<nav><img alt="Instagram" src="/media/logo.gif" width="103" height="29"></nav>
+<main><p>Home feed</p></main>
+"""
+
+PROFILE_BODY = """
+<header>
+  <h2>__USERNAME__</h2>
+  __PRIVATE__
+  <ul>
+    <li><span><span>__POSTS__</span></span> posts</li>
+    <li><a href="/__USERNAME__/followers/" class="count-link" data-kind="followers"><span><span>__FOLLOWERS__</span></span> followers</a></li>
+    <li><a href="/__USERNAME__/following/" class="count-link" data-kind="following"><span><span>__FOLLOWING__</span></span> following</a></li>
+  </ul>
+  <p class="bio">__BIO__</p>
+</header>
+<section id="page-list"></section>
+"""
+
+# Client side of the mock: opens the list dialog, pages through the API as the
+# list scrolls, optionally virtualizes rows away, and backs the search box.
+PAGE_SCRIPT = """
+function beacon(name) {
+    try { navigator.sendBeacon('/logging/falco', 'event=' + name); } catch (e) {}
+}
+beacon('page_view');
+
+function rowNode(user) {
+    var row = document.createElement(CONFIG.variant === 'list' ? 'li' : 'div');
+    row.className = 'row';
+    row.innerHTML = '<img src="/media/avatar/' + user.pk + '.jpg" alt="">' +
+        '<div><a href="/' + user.username + '/" role="link">' + user.username + '</a>' +
+        '<div>' + user.full_name + '</div></div>';
+    return row;
+}
+
+function openList(kind, list, scroller, isWindow) {
+    var state = {maxId: null, done: false, loading: false, query: ''};
+    var spacer = document.createElement('div');
+    spacer.style.height = '0px';
+    list.appendChild(spacer);
+
+    function nearBottom() {
+        if (isWindow) return window.innerHeight + window.scrollY >= document.body.scrollHeight - 300;
+        return scroller.scrollTop + scroller.clientHeight >= scroller.scrollHeight - 300;
+    }
+
+    function virtualize() {
+        if (!CONFIG.virtualize) return;
+        var rows = list.querySelectorAll('.row');
+        var extra = rows.length - CONFIG.virtualize;
+        for (var i = 0; i < extra; i++) {
+            spacer.style.height = (parseInt(spacer.style.height, 10) + rows[i].offsetHeight) + 'px';
+            rows[i].remove();
+        }
+    }
+
+    function load() {
+        if (state.loading || state.done) return;
+        state.loading = true;
+        var url = '/api/v1/friendships/' + CONFIG.profileId + '/' + kind + '/?count=' + CONFIG.pageSize;
+        if (state.maxId) url += '&max_id=' + encodeURIComponent(state.maxId);
+        if (state.query) url += '&query=' + encodeURIComponent(state.query);
+        fetch(url, {credentials: 'same-origin'}).then(function (response) {
+            if (!response.ok) throw new Error('HTTP ' + response.status);
+            return response.json();
+        }).then(function (data) {
+            for (var i = 0; i < data.users.length; i++) list.appendChild(rowNode(data.users[i]));
+            state.maxId = data.next_max_id || null;
+            state.done = !data.next_max_id;
+            state.loading = false;
+            virtualize();
+            if (!state.done && nearBottom()) load();
+        }).catch(function () {
+            state.loading = false;
+            setTimeout(load, CONFIG.retryMs);
+        });
+    }
+
+    (isWindow ? window : scroller).addEventListener('scroll', function () {
+        if (nearBottom()) load();
+    });
+
+    return {
+        load: load,
+        search: function (query) {
+            state = {maxId: null, done: false, loading: false, query: query};
+            var rows = list.querySelectorAll('.row');
+            for (var i = 0; i < rows.length; i++) rows[i].remove();
+            spacer.style.height = '0px';
+            load();
+        }
+    };
+}
+
+function openDialog(kind) {
+    closeDialog();
+    var dialog = document.createElement('div');
+    dialog.setAttribute('role', 'dialog');
+    dialog.innerHTML = '<div><h1>' + (kind === 'following' ? 'Following' : 'Followers') + '</h1>' +
+        '<input type="text" placeholder="Search" aria-label="Search"></div>' +
+        '<div class="scroll-box" style="overflow-y: auto; height: ' + CONFIG.dialogHeight + 'px;">' +
+        (CONFIG.variant === 'list' ? '<ul></ul>' : '<div></div>') + '</div>';
+    document.body.appendChild(dialog);
+    var scroller = dialog.querySelector('.scroll-box');
+    var controller = openList(kind, scroller.firstChild, scroller, false);
+    var timer = null;
+    dialog.querySelector('input').addEventListener('input', function (event) {
+        clearTimeout(timer);
+        timer = setTimeout(function () { controller.search(event.target.value); }, 200);
+    });
+    controller.load();
+}
+
+function closeDialog() {
+    var dialog = document.querySelector('div[role="dialog"]');
+    if (dialog) dialog.remove();
+}
+
+document.addEventListener('keydown', function (event) {
+    if (event.key === 'Escape') closeDialog();
+});
+
+var links = document.querySelectorAll('a.count-link');
+for (var i = 0; i < links.length; i++) {
+    links[i].addEventListener('click', function (event) {
+        event.preventDefault();
+        if (CONFIG.isPrivate) return;
+        openDialog(this.getAttribute('data-kind'));
+    });
+}
+
+if (CONFIG.pageList) {
+    openList(CONFIG.pageList, document.getElementById('page-list'), null, true).load();
+}
+"""
+
+
+def generate_usernames(count, rng, taken=None):
+    """Generate count distinct, Instagram-looking usernames"""
+    taken = set(taken or ())
+    alphabet = string.ascii_lowercase + string.digits + "._"
+    usernames = []
+    while len(usernames) < count:
+        name = rng.choice(string.ascii_lowercase) + "".join(
+            rng.choice(alphabet) for _ in range(rng.randint(3, 14))) + rng.choice(string.ascii_lowercase)
+        if name in taken or name in RESERVED_NAMES:
+            continue
+        taken.add(name)
+        usernames.append(name)
+    return usernames
+
+
+class MockInstagram:
+    """A configurable local Instagram stand-in with known ground truth"""
+
+    def __init__(self, owner="bench_user", following_count=500, followers_count=None, overlap=0.8,
+                 page_size=12, page_latency=0.1, avatar_latency=0.05, variant="div", virtualize=0,
+                 failure_rate=0.0, fail_after=None, private_rate=0.1, dialog_height=400,
+                 fixtures_dir=None, seed=0, host="127.0.0.1", port=0):
+        self.owner = owner
+        self.page_size = page_size
+        self.page_latency = page_latency
+        self.avatar_latency = avatar_latency
+        self.variant = variant
+        self.virtualize = virtualize
+        self.failure_rate = failure_rate
+        self.fail_after = fail_after
+        self.dialog_height = dialog_height
+        self.host = host
+        self.port = port
+        self.rng = random.Random(seed)
+
+        if followers_count is None:
+            followers_count = following_count
+
+        # Ground truth: most followed accounts follow back, the rest of the followers are new
+        self.following = generate_usernames(following_count, self.rng, {owner})
+        followed_back = self.rng.sample(self.following, min(int(following_count * overlap), followers_count))
+        self.followers = followed_back + generate_usernames(
+            followers_count - len(followed_back), self.rng, set(self.following) | {owner})
+        self.rng.shuffle(self.followers)
+
+        # Recorded network captures replace the generated lists
+        self.fixtures = {}
+        if fixtures_dir:
+            self.load_fixtures(fixtures_dir)
+
+        follower_set = set(self.followers)
+        self.non_followers = [user for user in self.following if user not in follower_set]
+
+        everyone = [owner] + self.following + self.followers
+        self.user_ids = {OWNER_ID: owner}
+        self.ids_by_username = {owner: OWNER_ID}
+        for index, username in enumerate(everyone[1:], start=1000):
+            if username not in self.ids_by_username:
+                self.ids_by_username[username] = str(index)
+                self.user_ids[str(index)] = username
+
+        self.private_accounts = set(self.rng.sample(everyone[1:], int((len(everyone) - 1) * private_rate)))
+
+        self.stats = {}
+        self.stats_lock = threading.Lock()
+        self.pages_served = 0
+        self.server = None
+        self.thread = None
+
+    def load_fixtures(self, fixtures_dir):
+        """Replay list pages recorded with --capture-dir instead of the generated lists"""
+        from main import parse_user_records
+
+        for kind in ("following", "followers"):
+            pages = []
+            for path in sorted(glob.glob(os.path.join(fixtures_dir, f"{kind}_*.json"))):
+                with open(path, 'r') as f:
+                    recorded = json.load(f)
+                pages.append(self.rest_page(parse_user_records(json.loads(recorded["body"]), kind)))
+            if pages:
+                self.fixtures[kind] = pages
+                usernames = [user["username"] for page in pages for user in page["users"]]
+                setattr(self, kind, list(dict.fromkeys(usernames)))
+
+    @staticmethod
+    def rest_page(records):
+        """A friendships REST page for (username, user_id) pairs, the shape the dialog script reads.
+
+        Recorded GraphQL pages are served in this shape too.
+        """
+        users = [{"pk": user_id, "pk_id": user_id, "username": username, "full_name": username.title()}
+                 for username, user_id in records]
+        return {"users": users, "status": "ok"}
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}/"
+
+    def count(self, key, amount=1):
+        with self.stats_lock:
+            self.stats[key] = self.stats.get(key, 0) + amount
+
+    def start(self):
+        """Serve in a background thread. Returns the base URL"""
+        handler = type("MockHandler", (MockRequestHandler,), {"mock": self})
+        self.server = ThreadingHTTPServer((self.host, self.port), handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self.base_url
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def follows_owner(self, username):
+        return username in set(self.followers)
+
+    def user_record(self, username):
+        user_id = self.ids_by_username.get(username, "0")
+        return {"pk": user_id, "pk_id": user_id, "username": username, "full_name": username.title(),
+                "is_private": username in self.private_accounts,
+                "profile_pic_url": f"/media/avatar/{user_id}.jpg"}
+
+    def list_page(self, user_id, kind, max_id, count, query):
+        """One page of a friendships response"""
+        if user_id == OWNER_ID and kind in self.fixtures:
+            index = int(max_id or 0)
+            page = dict(self.fixtures[kind][index])
+            page.pop("next_max_id", None)
+            if index + 1 < len(self.fixtures[kind]):
+                page["next_max_id"] = str(index + 1)
+            return page
+
+        if user_id == OWNER_ID:
+            users = self.following if kind == "following" else self.followers
+        else:
+            # Other accounts only expose whether they follow the owner
+            username = self.user_ids.get(user_id, "")
+            follows = kind == "following" and self.follows_owner(username)
+            users = ([self.owner] if follows else []) + self.following[:count]
+
+        if query:
+            users = [user for user in users if query.lower() in user.lower()]
+
+        offset = int(max_id or 0)
+        page = users[offset:offset + count]
+        response = {"users": [self.user_record(user) for user in page], "status": "ok",
+                    "big_list": len(users) > count, "page_size": count}
+        if offset + count < len(users):
+            response["next_max_id"] = str(offset + count)
+        return response
+
+    def render(self, title, body, description="", **config):
+        config.setdefault("variant", self.variant)
+        config.setdefault("pageSize", self.page_size)
+        config.setdefault("virtualize", self.virtualize)
+        config.setdefault("dialogHeight", self.dialog_height)
+        config.setdefault("retryMs", 1000)
+        return (PAGE_TEMPLATE.replace("__TITLE__", title)
+                .replace("__DESCRIPTION__", description)
+                .replace("__BODY__", body)
+                .replace("__CONFIG__", json.dumps(config))
+                .replace("__SCRIPT__", PAGE_SCRIPT))
+
+    def render_profile(self, username, page_list=None):
+        if username == self.owner:
+            following, followers = len(self.following), len(self.followers)
+        else:
+            following = len(self.following) + (1 if self.follows_owner(username) else 0)
+            followers = len(self.followers)
+
+        is_private = username in self.private_accounts
+        body = (PROFILE_BODY.replace("__USERNAME__", username)
+                .replace("__PRIVATE__", "<h2>This account is Private</h2>" if is_private else "")
+                .replace("__POSTS__", "12")
+                .replace("__FOLLOWERS__", f"{followers:,}")
+                .replace("__FOLLOWING__", f"{following:,}")
+                .replace("__BIO__", f"Just {username} things"))
+        description = f"{followers:,} Followers, {following:,} Following, 12 Posts - See Instagram photos and videos from {username}"
+        return self.render(f"{username} - Instagram", body, description,
+                           profileId=self.ids_by_username.get(username, "0"),
+                           isPrivate=is_private, pageList=page_list)
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    mock = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+        data = body if isinstance(body, bytes) else body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or []):
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_json(self, status, payload):
+        self.send_body(status, json.dumps(payload), "application/json; charset=utf-8")
+
+    def logged_in(self):
+        return "sessionid=" in (self.headers.get("Cookie") or "")
+
+    def do_POST(self):
+        mock = self.mock
+        path = urlparse(self.path).path
+        length = int(self.headers.get("Content-Length") or 0)
+        form = parse_qs(self.rfile.read(length).decode("utf-8")) if length else {}
+
+        if path.startswith("/logging/"):
+            mock.count("beacons")
+            self.send_body(204, b"")
+        elif path == "/accounts/login/":
+            mock.count("logins")
+            username = (form.get("username") or [""])[0]
+            if username != mock.owner:
+                self.send_body(200, mock.render("Login", LOGIN_BODY + "<p>Wrong username</p>"))
+                return
+            self.send_body(302, b"", headers=[
+                ("Location", "/"),
+                ("Set-Cookie", f"sessionid=mock{random.getrandbits(64):x}; Path=/"),
+                ("Set-Cookie", f"ds_user_id={OWNER_ID}; Path=/"),
+                ("Set-Cookie", "csrftoken=mockcsrf; Path=/"),
+            ])
+        else:
+            self.send_body(404, "Not found")
+
+    def do_GET(self):
+        mock = self.mock
+        url = urlparse(self.path)
+        path = url.path
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in path.split("/") if part]
+
+        if path.startswith("/media/"):
+            mock.count("media")
+            time.sleep(mock.avatar_latency)
+            self.send_body(200, AVATAR_BYTES, "image/gif")
+        elif path.startswith("/logging/"):
+            mock.count("beacons")
+            self.send_body(204, b"")
+        elif path.startswith("/api/v1/friendships/") and len(parts) == 5:
+            self.serve_list_page(parts[3], parts[4], query)
+        elif path == "/api/v1/users/web_profile_info/":
+            username = query.get("username", "")
+            self.send_json(200, {"data": {"user": {"id": mock.ids_by_username.get(username, "0"),
+                                                   "username": username}}, "status": "ok"})
+        elif not parts:
+            mock.count("page_views")
+            if self.logged_in():
+                self.send_body(200, mock.render("Instagram", HOME_BODY))
+            else:
+                self.send_body(200, mock.render("Login", LOGIN_BODY))
+        elif parts[0] == "accounts":
+            mock.count("page_views")
+            self.send_body(200, mock.render("Login", LOGIN_BODY))
+        elif len(parts) == 1:
+            mock.count("page_views")
+            self.send_body(200, mock.render_profile(parts[0]))
+        elif len(parts) == 2 and parts[1] in ("following", "followers"):
+            # Full-page list, used by the alternative extraction methods
+            mock.count("page_views")
+            self.send_body(200, mock.render_profile(parts[0], page_list=parts[1]))
+        else:
+            self.send_body(404, "Not found")
+
+    def serve_list_page(self, user_id, kind, query):
+        mock = self.mock
+        if not self.logged_in():
+            self.send_json(401, {"message": "login_required", "status": "fail"})
+            return
+
+        time.sleep(mock.page_latency)
+
+        with mock.stats_lock:
+            mock.pages_served += 1
+            pages_served = mock.pages_served
+
+        # Injected failures: random server errors, or a hard rate limit after N pages
+        if mock.fail_after is not None and pages_served > mock.fail_after:
+            mock.count("api_rate_limited")
+            self.send_json(429, {"message": "Please wait a few minutes before you try again.", "status": "fail"})
+            return
+        if mock.failure_rate and mock.rng.random() < mock.failure_rate:
+            mock.count("api_failures")
+            self.send_json(500, {"message": "Internal error", "status": "fail"})
+            return
+
+        mock.count("api_pages")
+        count = int(query.get("count") or mock.page_size)
+        self.send_json(200, mock.list_page(user_id, kind, query.get("max_id"), count, query.get("query", "")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Instagram stand-in for testing and benchmarks")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000)")
+    parser.add_argument("--owner", default="bench_user", help="Username that can log in (default: bench_user)")
+    parser.add_argument("--following", type=int, default=500, help="Size of the following list (default: 500)")
+    parser.add_argument("--followers", type=int, help="Size of the followers list (default: same as following)")
+    parser.add_argument("--page-size", type=int, default=12, help="Users per API page (default: 12)")
+    parser.add_argument("--page-latency", type=float, default=0.1, help="Seconds per API page (default: 0.1)")
+    parser.add_argument("--avatar-latency", type=float, default=0.05, help="Seconds per avatar image (default: 0.05)")
+    parser.add_argument("--variant", choices=["div", "list"], default="div", help="Dialog row markup (default: div)")
+    parser.add_argument("--virtualize", type=int, default=0,
+                        help="Keep only this many rows in the DOM (default: 0, keep all)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of API pages that fail with 500")
+    parser.add_argument("--fail-after", type=int, help="Answer every API page after this many with 429")
+    parser.add_argument("--fixtures-dir", help="Replay list responses recorded with --capture-dir")
+    args = parser.parse_args()
+
+    mock = MockInstagram(owner=args.owner, following_count=args.following, followers_count=args.followers,
+                         page_size=args.page_size, page_latency=args.page_latency,
+                         avatar_latency=args.avatar_latency, variant=args.variant, virtualize=args.virtualize,
+                         failure_rate=args.failure_rate, fail_after=args.fail_after,
+                         fixtures_dir=args.fixtures_dir, port=args.port)
+    mock.start()
+    print(f"Mock Instagram for '{mock.owner}' at {mock.base_url} "
+          f"({len(mock.following)} following, {len(mock.followers)} followers, "
+          f"{len(mock.non_followers)} non-followers). Ctrl-C to stop.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()